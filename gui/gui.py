@@ -6,11 +6,16 @@ pip install PyQt6
 '''
 import sys
 import os
-import pandas as pd
-from functools import partial
+import functools
+import hashlib
+import warnings
+from itertools import compress
+import numpy as np
 
 # This is to ensure the printer_calibration module can be found when running this script directly.
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+# Importing the module leaves sys.path alone; the package is then expected to be importable already.
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 __version__ = "0.5.0"
 
@@ -18,23 +23,159 @@ try:
     from PyQt6.QtWidgets import (
         QApplication, QMainWindow, QTabWidget, QWidget, QVBoxLayout,
         QFormLayout, QGroupBox, QLabel, QLineEdit, QPushButton,
-        QMessageBox, QFileDialog, QTextEdit, QHBoxLayout, QTableWidget, QDialog,
-        QTableWidgetItem, QHeaderView, QComboBox, QStyledItemDelegate
+        QMessageBox, QFileDialog, QTextEdit, QHBoxLayout, QTableView, QDialog,
+        QHeaderView, QComboBox, QStyledItemDelegate
     )
     from PyQt6.QtGui import QAction, QDoubleValidator
-    from PyQt6.QtCore import Qt
+    from PyQt6.QtCore import (
+        Qt, QAbstractTableModel, QModelIndex, QTimer, QObject, QRunnable,
+        QThreadPool, QSignalBlocker, pyqtSignal
+    )
 except ImportError:
     print("PyQt6 is not installed. Please install it using: pip install PyQt6")
     sys.exit(1)
 
 try:
-    from printer_calibration import charts, io, config
+    from printer_calibration import analysis, charts, io, config
     from printer_calibration.controller import CalibrationController, CalibrationPhase
 except ImportError as e:
     print(f"Could not import 'printer_calibration' module: {e}")
     print("Please ensure you are running this from the project's root directory.")
     sys.exit(1)
 
+# pyarrow is optional; when present it is used for the faster CSV reader and
+# the on-disk cache of parsed measurement files.
+try:
+    import pyarrow as pa
+    import pyarrow.feather as pa_feather
+except ImportError:
+    pa = None
+
+# Patch names per chart type in table order, and as sets for validation.
+_PATCH_NAMES = {
+    "Neutral": tuple(p[0] for p in config.NEUTRAL_PATCHES),
+    "Colour": config.COLOUR_PATCH_NAMES,
+}
+_PATCH_NAME_SETS = {chart_type: frozenset(names) for chart_type, names in _PATCH_NAMES.items()}
+
+# Display names for each phase, built once rather than on every status refresh.
+_PHASE_LABELS = {phase: str(phase) for phase in CalibrationPhase}
+
+# Phases whose measurements come from the colour chart; all others use the neutral chart.
+_COLOUR_CHART_PHASES = frozenset({
+    CalibrationPhase.PHASE_4_COLOR_ANALYSIS,
+    CalibrationPhase.PHASE_5_ICC_CONSTRUCTION,
+    CalibrationPhase.PHASE_6_VALIDATION,
+    CalibrationPhase.COMPLETE,
+})
+
+# Numeric helpers that can be compiled with numba from the Advanced menu,
+# with sample arguments used to trigger compilation up front.
+_JIT_TARGETS = (
+    (analysis, "get_lab_distance", ((50.0, 0.0, 0.0), (50.0, 0.0, 0.0))),
+)
+
+
+_CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+    "printerColourCalibration",
+)
+# Cached frames kept in _CACHE_DIR; the least recently used beyond this are removed.
+_CACHE_MAX_FILES = 32
+# Schema metadata key holding the loader warnings, replayed on cache hits.
+_CACHE_WARNINGS_KEY = b"printer_calibration.warnings"
+
+
+@functools.lru_cache(maxsize=None)
+def _loader_fingerprint():
+    """Identifies the CSV loader so frames cached by an older version are not reused."""
+    with open(io.__file__, "rb") as f:
+        source = f.read()
+    return hashlib.blake2b(source, digest_size=8).hexdigest()
+
+
+def _prune_cache():
+    """Removes the least recently used cache files beyond ``_CACHE_MAX_FILES``."""
+    entries = []
+    with os.scandir(_CACHE_DIR) as it:
+        for entry in it:
+            if entry.name.endswith(".feather"):
+                entries.append((entry.stat().st_mtime_ns, entry.path))
+    entries.sort(reverse=True)
+    for _, path in entries[_CACHE_MAX_FILES:]:
+        os.remove(path)
+
+
+def _read_csv(filepath):
+    """Loads a measurement CSV, using the pyarrow reader when available.
+
+    With pyarrow installed the parsed frame is also kept as a feather file in
+    ``_CACHE_DIR``, keyed on the file's path, mtime and size, the loader
+    version and the columns read, so reloading an unchanged file skips CSV
+    parsing entirely. Warnings raised while parsing are stored with the frame
+    and raised again on a cache hit. Only the ``_CACHE_MAX_FILES`` most
+    recently used files are kept.
+    """
+    columns = io.CANONICAL_ANALYSIS_COLUMNS
+    if pa is None:
+        return io.load_csv(filepath, engine="pandas", columns=columns)
+
+    stat = os.stat(filepath)
+    key = "|".join([
+        os.path.abspath(filepath), str(stat.st_mtime_ns), str(stat.st_size),
+        _loader_fingerprint(), ",".join(sorted(columns)),
+    ])
+    digest = hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+    cache_path = os.path.join(_CACHE_DIR, digest + ".feather")
+    try:
+        table = pa_feather.read_table(cache_path)
+    except (OSError, pa.ArrowInvalid):
+        pass
+    else:
+        try:
+            os.utime(cache_path)  # Mark as recently used for pruning
+        except OSError:
+            pass
+        stored = (table.schema.metadata or {}).get(_CACHE_WARNINGS_KEY)
+        for message in stored.decode().split("\n") if stored else ():
+            warnings.warn(message)
+        return table.to_pandas()
+
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        df = io.load_csv(filepath, engine="pyarrow", columns=columns)
+    messages = [str(w.message) for w in caught]
+    for w in caught:
+        warnings.warn_explicit(w.message, w.category, w.filename, w.lineno)
+    try:
+        os.makedirs(_CACHE_DIR, exist_ok=True)
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        if messages:
+            metadata = dict(table.schema.metadata or {})
+            metadata[_CACHE_WARNINGS_KEY] = "\n".join(messages).encode()
+            table = table.replace_schema_metadata(metadata)
+        pa_feather.write_feather(table, cache_path)
+        _prune_cache()
+    except (OSError, pa.ArrowException):
+        pass  # The cache is best-effort; the parsed frame is still returned.
+    return df
+
+
+def _write_csv(records, filepath):
+    """Writes measurement records to ``filepath`` as ``patch,rgb,L,a,b_lab``.
+
+    Each record only holds a name, an rgb label and three floats, so rows
+    are formatted straight into a 64 KiB buffered file instead of going
+    through a general-purpose CSV writer. b* is written as ``b_lab`` so that
+    io.load_csv does not read it back as the blue channel.
+    """
+    with open(filepath, "w", buffering=1 << 16, newline="\n") as f:
+        f.write("patch,rgb,L,a,b_lab\n")
+        f.writelines(
+            f"{r['patch']},{r['rgb']},{r['L']:.4f},{r['a']:.4f},{r['b']:.4f}\n"
+            for r in records
+        )
+
 
 # The a* and b* channels in CIELAB are theoretically unbounded, but in practice
 # a range of -128 to 127 is used by many applications, including Photoshop.
@@ -44,13 +185,14 @@ class LabValueDelegate(QStyledItemDelegate):
         super().__init__(parent)
         self.min_val = min_val
         self.max_val = max_val
+        # Validator for float with 2 decimal places in the specified range,
+        # shared by every editor this delegate creates.
+        self._validator = QDoubleValidator(min_val, max_val, 2, self)
+        self._validator.setNotation(QDoubleValidator.Notation.StandardNotation)
 
     def createEditor(self, parent, option, index):
         editor = QLineEdit(parent)
-        # Validator for float with 2 decimal places in the specified range.
-        validator = QDoubleValidator(self.min_val, self.max_val, 2, editor)
-        validator.setNotation(QDoubleValidator.Notation.StandardNotation)
-        editor.setValidator(validator)
+        editor.setValidator(self._validator)
         return editor
 
     def setEditorData(self, editor, index):
@@ -61,6 +203,147 @@ class LabValueDelegate(QStyledItemDelegate):
         model.setData(index, editor.text(), Qt.ItemDataRole.EditRole)
 
 
+def _format_lab(lab):
+    """Formats Lab values to two decimals in one vectorized pass; NaN becomes ''."""
+    # object dtype so single-cell edits are not truncated to the array's width
+    text = np.char.mod("%.2f", lab).astype(object)
+    text[np.isnan(lab)] = ""
+    return text
+
+
+class LabTableModel(QAbstractTableModel):
+    """Table model holding patch names and their measured L*, a*, b* values.
+
+    The Lab values are stored in a single (N, 3) float array, with NaN
+    marking a cell that has not been filled in yet. Their display strings
+    are kept alongside in ``text`` and formatted in bulk whenever the rows
+    are replaced, so painting does no per-cell formatting.
+
+    Both arrays are views into buffers of ``capacity`` rows, so switching
+    between charts of different sizes reuses the same storage.
+    """
+    HEADERS = ("Patch", "L*", "a*", "b*")
+    # Patch names are read-only and skipped when tabbing; Lab cells are editable.
+    _PATCH_FLAGS = Qt.ItemFlag.ItemIsEnabled
+    _LAB_FLAGS = Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEditable
+
+    def __init__(self, parent=None, capacity=0):
+        super().__init__(parent)
+        self.names = []
+        self._lab_buffer = np.full((capacity, 3), np.nan)
+        self._text_buffer = np.full((capacity, 3), "", dtype=object)
+        self._set_row_count(0)
+
+    def _set_row_count(self, rows):
+        """Points ``lab``/``text`` at the first ``rows`` rows, growing the buffers if needed."""
+        if rows > len(self._lab_buffer):
+            self._lab_buffer = np.full((rows, 3), np.nan)
+            self._text_buffer = np.full((rows, 3), "", dtype=object)
+        self.lab = self._lab_buffer[:rows]
+        self.text = self._text_buffer[:rows]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.names)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role not in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return None
+        row, col = index.row(), index.column()
+        if col == 0:
+            return self.names[row]
+        return self.text[row, col - 1]
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if not index.isValid() or index.column() == 0 or role != Qt.ItemDataRole.EditRole:
+            return False
+        text = str(value).strip()
+        try:
+            number = float(text) if text else np.nan
+        except ValueError:
+            return False
+        self.lab[index.row(), index.column() - 1] = number
+        self.text[index.row(), index.column() - 1] = "" if np.isnan(number) else f"{number:.2f}"
+        self.dataChanged.emit(index, index, [role])
+        return True
+
+    def flags(self, index):
+        return self._PATCH_FLAGS if index.column() == 0 else self._LAB_FLAGS
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def set_patches(self, names, lab=None):
+        """Sets the rows to ``names``; Lab cells are cleared unless ``lab`` is given.
+
+        The preallocated storage is written in place. If the row count is
+        unchanged, views receive one dataChanged signal instead of a full reset.
+        """
+        names = list(names)
+        resized = len(names) != len(self.names)
+        if resized:
+            self.beginResetModel()
+            self._set_row_count(len(names))
+
+        self.names[:] = names
+        if lab is None:
+            # Cleared rows need no formatting pass.
+            self.lab.fill(np.nan)
+            self.text.fill("")
+        else:
+            self.lab[:] = lab
+            self.text[:] = _format_lab(self.lab)
+
+        if resized:
+            self.endResetModel()
+        elif names:
+            self.dataChanged.emit(self.index(0, 0), self.index(len(names) - 1, len(self.HEADERS) - 1))
+
+
+class _WorkerSignals(QObject):
+    """Signals used by _Worker to hand its outcome back to the GUI thread."""
+    done = pyqtSignal(object)
+    error = pyqtSignal(object)
+
+
+class _Worker(QRunnable):
+    """Runs ``fn(*args, **kwargs)`` on a QThreadPool thread.
+
+    The return value is emitted through ``signals.done`` and any exception
+    through ``signals.error``; both are delivered on the GUI thread, so the
+    connected slots may touch widgets and show message boxes.
+    """
+    def __init__(self, fn, *args, **kwargs):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = _WorkerSignals()
+
+    def run(self):
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            self.signals.error.emit(e)
+        else:
+            self.signals.done.emit(result)
+
+
+def _run_in_thread_pool(fn, *args, on_done, on_error, **kwargs):
+    """Starts ``fn`` on the global QThreadPool and returns the worker.
+
+    Callers should keep a reference to the returned worker until one of the
+    callbacks has fired so its signals object outlives the queued emit.
+    """
+    worker = _Worker(fn, *args, **kwargs)
+    worker.signals.done.connect(on_done)
+    worker.signals.error.connect(on_error)
+    QThreadPool.globalInstance().start(worker)
+    return worker
 
 
 class ChartsTab(QWidget):
@@ -74,9 +357,9 @@ class ChartsTab(QWidget):
         neutral_layout = QFormLayout()
         self.neutral_file_input = QLineEdit("neutral_chart_A4.pdf")
         neutral_layout.addRow("Filename:", self.neutral_file_input)
-        generate_neutral_button = QPushButton("Generate")
-        generate_neutral_button.clicked.connect(self.generate_neutral_chart)
-        neutral_layout.addRow(generate_neutral_button)
+        self.generate_neutral_button = QPushButton("Generate")
+        self.generate_neutral_button.clicked.connect(self.generate_neutral_chart)
+        neutral_layout.addRow(self.generate_neutral_button)
         neutral_group_box.setLayout(neutral_layout)
         main_layout.addWidget(neutral_group_box)
 
@@ -84,43 +367,52 @@ class ChartsTab(QWidget):
         colour_layout = QFormLayout()
         self.colour_file_input = QLineEdit("colour_test_A4.pdf")
         colour_layout.addRow("Filename:", self.colour_file_input)
-        generate_colour_button = QPushButton("Generate")
-        generate_colour_button.clicked.connect(self.generate_colour_chart)
-        colour_layout.addRow(generate_colour_button)
+        self.generate_colour_button = QPushButton("Generate")
+        self.generate_colour_button.clicked.connect(self.generate_colour_chart)
+        colour_layout.addRow(self.generate_colour_button)
         colour_group_box.setLayout(colour_layout)
         main_layout.addWidget(colour_group_box)
+        # Running workers; each is kept until its callback fires so its
+        # signals object outlives the queued emit, even with both charts busy.
+        self._workers = set()
 
     def generate_neutral_chart(self):
-        filename = self.neutral_file_input.text().strip()
-        if not filename:
-            QMessageBox.warning(self, "Invalid Filename", "Filename cannot be empty.")
-            return
-        if not filename.endswith(".pdf"):
-            QMessageBox.warning(self, "Invalid Filename", "Filename must end with .pdf")
-            return
-        try:
-            charts.generate_neutral_chart(filename, format="PDF")
-            QMessageBox.information(self, "Success", f"Successfully generated {filename}")
-        except PermissionError:
-             QMessageBox.critical(self, "Error", f"Could not write to file '{filename}'. It might be open in another program.")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to generate chart:\n{e}")
+        self._generate_chart(charts.generate_neutral_chart, self.neutral_file_input, self.generate_neutral_button)
 
     def generate_colour_chart(self):
-        filename = self.colour_file_input.text().strip()
+        self._generate_chart(charts.generate_colour_chart, self.colour_file_input, self.generate_colour_button)
+
+    def _generate_chart(self, generator, file_input, button):
+        """Validates the filename entered in ``file_input`` and writes the chart as a PDF.
+
+        Rendering runs on the thread pool; ``button`` is disabled until it finishes.
+        """
+        filename = file_input.text().strip()
         if not filename:
             QMessageBox.warning(self, "Invalid Filename", "Filename cannot be empty.")
             return
-        if not filename.endswith(".pdf"):
+        if not filename.lower().endswith(".pdf"):
             QMessageBox.warning(self, "Invalid Filename", "Filename must end with .pdf")
             return
-        try:
-            charts.generate_colour_chart(filename, format="PDF")
+
+        def finished(_):
+            self._workers.discard(worker)
+            button.setEnabled(True)
             QMessageBox.information(self, "Success", f"Successfully generated {filename}")
-        except PermissionError:
-             QMessageBox.critical(self, "Error", f"Could not write to file '{filename}'. It might be open in another program.")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to generate chart:\n{e}")
+
+        def failed(e):
+            self._workers.discard(worker)
+            button.setEnabled(True)
+            if isinstance(e, PermissionError):
+                QMessageBox.critical(self, "Error", f"Could not write to file '{filename}'. It might be open in another program.")
+            else:
+                QMessageBox.critical(self, "Error", f"Failed to generate chart:\n{e}")
+
+        button.setEnabled(False)
+        worker = _run_in_thread_pool(
+            generator, filename, format="PDF", on_done=finished, on_error=failed
+        )
+        self._workers.add(worker)
 
 
 class AnalysisTab(QWidget):
@@ -130,13 +422,14 @@ class AnalysisTab(QWidget):
         self.main_window = main_window
         self.controller = main_window.controller
         self.current_chart_type = None
+        self._last_phase = None
         
         main_layout = QVBoxLayout(self)
 
         # --- Data Table ---
-        self.table = QTableWidget()
-        self.table.setColumnCount(4)
-        self.table.setHorizontalHeaderLabels(["Patch", "L*", "a*", "b*"])
+        self.model = LabTableModel(self, capacity=max(len(names) for names in _PATCH_NAMES.values()))
+        self.table = QTableView()
+        self.table.setModel(self.model)
         self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
         self.table.verticalHeader().setVisible(False)
         
@@ -155,28 +448,44 @@ class AnalysisTab(QWidget):
         load_button.clicked.connect(self.load_from_csv)
         save_button = QPushButton("Save to CSV...")
         save_button.clicked.connect(self.save_to_csv)
-        process_button = QPushButton("Process Measurements")
-        process_button.clicked.connect(self.process_data_from_table)
+        self.process_button = QPushButton("Process Measurements")
+        self.process_button.clicked.connect(self.process_data_from_table)
         
         button_layout.addWidget(load_button)
         button_layout.addWidget(save_button)
         button_layout.addStretch()
-        button_layout.addWidget(process_button)
+        button_layout.addWidget(self.process_button)
         main_layout.addLayout(button_layout)
 
+        # Phase changes can arrive in quick succession (e.g. several skips from
+        # the Advanced menu); coalesce them so the table is rebuilt only once.
+        self._populate_timer = QTimer(self)
+        self._populate_timer.setSingleShot(True)
+        self._populate_timer.setInterval(50)
+        self._populate_timer.timeout.connect(self.populate_table)
+
         self.populate_table()
 
     def get_chart_type(self):
         """Determines the chart type based on the current calibration phase."""
-        phase = self.controller.get_current_phase()
-        if phase in [CalibrationPhase.PHASE_4_COLOR_ANALYSIS, CalibrationPhase.PHASE_5_ICC_CONSTRUCTION, CalibrationPhase.PHASE_6_VALIDATION, CalibrationPhase.COMPLETE]:
+        if self.controller.get_current_phase() in _COLOUR_CHART_PHASES:
             return "Colour"
         return "Neutral"
 
-    def update_ui_for_phase(self):
-        """Adjusts the chart type selection based on the current calibration phase."""
-        # Ensure the table is populated correctly after UI update
-        self.populate_table()
+    def update_ui_for_phase(self, phase=None):
+        """Adjusts the chart type selection based on the current calibration phase.
+
+        ``phase`` is passed by MainWindow.phaseChanged; when omitted it is read
+        from the controller. The table is repopulated after a short debounce;
+        only the last of a burst of phase changes does any work, and repeated
+        calls for the phase already shown do none.
+        """
+        if phase is None:
+            phase = self.controller.get_current_phase()
+        if phase == self._last_phase:
+            return
+        self._last_phase = phase
+        self._populate_timer.start()
 
     def populate_table(self):
         """Fills the 'Patch' column with names based on the selected chart type."""
@@ -187,65 +496,46 @@ class AnalysisTab(QWidget):
             return
         self.current_chart_type = chart_type
 
-        patches = config.NEUTRAL_PATCHES if chart_type == "Neutral" else config.COLOUR_PATCHES
-        
-        self.table.setRowCount(len(patches))
-        for i, patch_info in enumerate(patches):
-            name = patch_info[0]
-            patch_item = QTableWidgetItem(name)
-            # Make patch name non-editable and non-selectable for tabbing
-            patch_item.setFlags(Qt.ItemFlag.ItemIsEnabled)
-            self.table.setItem(i, 0, patch_item)
-            for j in range(1, 4): # Clear L, a, b columns
-                self.table.setItem(i, j, QTableWidgetItem(""))
-
-    def get_dataframe_from_table(self) -> pd.DataFrame | None:
-        """Reads the content of the QTableWidget and returns it as a DataFrame."""
-        rows = self.table.rowCount()
-        data = []
-        for i in range(rows):
-            try:
-                patch_item = self.table.item(i, 0)
-                l_item = self.table.item(i, 1)
-                
-                if not (patch_item and l_item and l_item.text()):
-                    continue
-
-                patch = patch_item.text()
-                l_val = float(l_item.text())
-                a_val = float(self.table.item(i, 2).text())
-                b_val = float(self.table.item(i, 3).text())
-                data.append({'patch': patch, 'L': l_val, 'a': a_val, 'b': b_val, 'rgb': 'N/A'})
-
-            except (ValueError, AttributeError) as e:
-                QMessageBox.warning(self, "Invalid Data", f"Please enter valid numbers for all fields in row {i+1} for patch {patch}.\nError: {e}")
-                return None
-        
-        if not data:
-            QMessageBox.warning(self, "No Data", "No valid measurement data was entered in the table.")
+        self.model.set_patches(_PATCH_NAMES[chart_type])
+
+    def get_records_from_table(self) -> list[dict] | None:
+        """Returns the measured rows of the table as patch/rgb/L/a/b dicts.
+
+        Returns ``None`` after warning if a row is only partly filled in, and
+        an empty list if nothing has been measured yet.
+        """
+        names, lab = self.model.names, self.model.lab
+        # Rows without an L* value have not been measured and are skipped.
+        measured = ~np.isnan(lab[:, 0])
+        incomplete = measured & np.isnan(lab[:, 1:]).any(axis=1)
+        if incomplete.any():
+            i = int(np.flatnonzero(incomplete)[0])
+            QMessageBox.warning(self, "Invalid Data", f"Please enter valid numbers for all fields in row {i+1} for patch {names[i]}.")
             return None
-            
-        return pd.DataFrame(data)
+
+        return [
+            {'patch': name, 'rgb': 'N/A', 'L': L, 'a': a, 'b': b}
+            for name, (L, a, b) in zip(compress(names, measured), lab[measured].tolist())
+        ]
 
     def process_data_from_table(self):
         """Gets data from the table and tells the main window to process it."""
-        df = self.get_dataframe_from_table()
-        if df is not None:
-            self.main_window.process_dataframe(df)
+        records = self.get_records_from_table()
+        if records is not None:
+            self.main_window.process_measurements(records)
 
     def load_from_csv(self):
         """Loads data from a CSV file, validates it, and populates the table."""
-        filepath, _ = QFileDialog.getOpenFileName(self, "Open Measurement File", "", "CSV Files (*.csv);;All Files (*)")
+        filepath = self.main_window.pick_file(QFileDialog.getOpenFileName, self, "Open Measurement File", "CSV Files (*.csv);;All Files (*)")
         if not filepath:
             return
 
         try:
-            loaded_df = io.load_csv(filepath)
+            loaded_df = _read_csv(filepath)
             
             # --- Validation ---
             chart_type = self.get_chart_type()
-            expected_patches_list = config.NEUTRAL_PATCHES if chart_type == "Neutral" else config.COLOUR_PATCHES
-            expected_patch_names = {p[0] for p in expected_patches_list}
+            expected_patch_names = _PATCH_NAME_SETS[chart_type]
             loaded_patch_names = set(loaded_df['patch'].astype(str))
 
             missing_patches = expected_patch_names - loaded_patch_names
@@ -257,20 +547,18 @@ class AnalysisTab(QWidget):
             if extra_patches:
                 QMessageBox.information(self, "Extra Patches", f"The loaded file contains extra patches not defined for a '{chart_type}' chart:\n\n" + "\n".join(sorted(extra_patches)))
 
+            # Align the loaded Lab values to the table's patch order in a
+            # single reindex; later duplicates win, as before.
+            indexed = loaded_df.set_index(loaded_df['patch'].astype(str))[['L', 'a', 'b']]
+            indexed = indexed[~indexed.index.duplicated(keep='last')]
+            expected_names = _PATCH_NAMES[chart_type]
+            aligned = indexed.reindex(list(expected_names)).to_numpy()
+
             # --- Populate Table ---
-            self.current_chart_type = None  # Force table refresh
-            self.populate_table() # Reset table to expected structure
-            
-            data_dict = {str(row['patch']): (row['L'], row['a'], row['b']) for _, row in loaded_df.iterrows()}
-            
-            for i in range(self.table.rowCount()):
-                patch_name = self.table.item(i, 0).text()
-                if patch_name in data_dict:
-                    lab = data_dict[patch_name]
-                    self.table.setItem(i, 1, QTableWidgetItem(f"{lab[0]:.2f}"))
-                    self.table.setItem(i, 2, QTableWidgetItem(f"{lab[1]:.2f}"))
-                    self.table.setItem(i, 3, QTableWidgetItem(f"{lab[2]:.2f}"))
-            
+            # Reset the table to the expected structure and values in one go.
+            self.current_chart_type = chart_type
+            self.model.set_patches(expected_names, aligned)
+
             self.main_window.results_text.append(f"Loaded and validated {os.path.basename(filepath)}.")
 
         except Exception as e:
@@ -278,18 +566,21 @@ class AnalysisTab(QWidget):
 
     def save_to_csv(self):
         """Saves the data from the table to a CSV file."""
-        filepath, _ = QFileDialog.getSaveFileName(self, "Save Measurements", "", "CSV Files (*.csv);;All Files (*)")
+        filepath = self.main_window.pick_file(QFileDialog.getSaveFileName, self, "Save Measurements", "CSV Files (*.csv);;All Files (*)")
         if not filepath:
             return
 
-        df = self.get_dataframe_from_table()
-        if df is not None:
-            try:
-                df_to_save = df[['patch', 'rgb', 'L', 'a', 'b']]
-                df_to_save.to_csv(filepath, index=False)
-                QMessageBox.information(self, "Success", f"Successfully saved measurements to {os.path.basename(filepath)}.")
-            except Exception as e:
-                QMessageBox.critical(self, "Error Saving File", f"Could not save the file:\n{e}")
+        records = self.get_records_from_table()
+        if records is None:
+            return
+        if not records:
+            QMessageBox.warning(self, "No Data", "No valid measurement data was entered in the table.")
+            return
+        try:
+            _write_csv(records, filepath)
+            QMessageBox.information(self, "Success", f"Successfully saved measurements to {os.path.basename(filepath)}.")
+        except Exception as e:
+            QMessageBox.critical(self, "Error Saving File", f"Could not save the file:\n{e}")
 
 
 class ExportTab(QWidget):
@@ -344,7 +635,7 @@ class ExportTab(QWidget):
             self.info_label.setText("Please complete the calibration analysis (Phase 4) before exporting.")
 
     def browse_save_location(self):
-        filename, _ = QFileDialog.getSaveFileName(self, "Save ICC Profile", "", "ICC Profile (*.icc);;All Files (*)")
+        filename = self.main_window.pick_file(QFileDialog.getSaveFileName, self, "Save ICC Profile", "ICC Profile (*.icc);;All Files (*)")
         if filename:
             self.file_path_input.setText(filename)
     
@@ -364,6 +655,10 @@ class ExportTab(QWidget):
 
 class MainWindow(QMainWindow):
     """Main application window."""
+    # Emitted with the current CalibrationPhase whenever the status is refreshed;
+    # each tab connects its own slot to keep itself in step with the phase.
+    phaseChanged = pyqtSignal(object)
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle(f"Printer Calibration GUI v{__version__}")
@@ -386,6 +681,8 @@ class MainWindow(QMainWindow):
         self.tab_widget.addTab(self.analysis_tab, "2. Analysis")
         self.tab_widget.addTab(self.export_tab, "3. Export Profile")
         main_layout.addWidget(self.tab_widget, 1)
+        self.phaseChanged.connect(self.export_tab.update_ui_state)
+        self.phaseChanged.connect(self.analysis_tab.update_ui_for_phase)
 
         # Right side: Status and Results
         status_results_widget = QWidget()
@@ -409,33 +706,72 @@ class MainWindow(QMainWindow):
         status_results_layout.addWidget(results_group)
         main_layout.addWidget(status_results_widget, 1)
 
+        self._process_worker = None
+        # Original functions swapped out while numba JIT is enabled.
+        self._jit_originals = []
+        # Directory of the last file picked in any dialog; "" starts in the working directory.
+        self.last_dir = ""
+        self._instructions_dialog = None
         self._create_menus()
         self.update_status_display()
         self.analysis_tab.update_ui_for_phase()
 
-    def process_dataframe(self, df):
-        """The single point for processing a dataframe and updating the UI."""
-        if df is None or df.empty:
-            self.results_text.append("Cannot process empty measurement data.")
+    def process_measurements(self, records):
+        """The single point for processing measurements and updating the UI."""
+        if not records:
+            QMessageBox.warning(self, "No Data", "No valid measurement data was entered in the table.")
             return
 
-        result_message = self.controller.process_measurements(df)
+        # Processing runs on the thread pool; the button and every action that
+        # replaces or changes the controller stay disabled until the result is
+        # back, so nothing touches the controller while the worker updates it.
+        self._set_processing(True)
+        self._process_worker = _run_in_thread_pool(
+            self.controller.process_measurements, records,
+            on_done=self._on_measurements_processed,
+            on_error=self._on_processing_failed,
+        )
+
+    def _set_processing(self, busy):
+        for widget in (self.analysis_tab.process_button, self.save_action, self.load_action,
+                       self.reset_action, self.skip_menu.menuAction()):
+            widget.setEnabled(not busy)
+        # ICC export reads the controller too; when idle its state follows the phase.
+        if busy:
+            self.export_tab.export_button.setEnabled(False)
+        else:
+            self.export_tab.update_ui_state(self.controller.get_current_phase())
+
+    def _on_measurements_processed(self, result_message):
+        self._set_processing(False)
         self.results_text.append(f"Controller: {result_message}\n")
         self.update_status_display()
 
+    def _on_processing_failed(self, error):
+        self._set_processing(False)
+        QMessageBox.critical(self, "Processing Error", f"Failed to process measurements:\n{error}")
+
+    def pick_file(self, dialog, parent, caption, file_filter):
+        """Runs ``dialog`` (a QFileDialog getOpenFileName/getSaveFileName) starting
+        in the last directory used, remembering the directory of the chosen file."""
+        filepath, _ = dialog(parent, caption, self.last_dir, file_filter)
+        if filepath:
+            self.last_dir = os.path.dirname(filepath)
+        return filepath
+
     def update_status_display(self):
         phase = self.controller.get_current_phase()
-        self.phase_label.setText(str(phase))
+        if phase == CalibrationPhase.PHASE_3_DRIVER_LOCK:
+            # Phase 3 needs no input; advance before drawing so the panel is
+            # refreshed once instead of again on the next event-loop pass.
+            self.controller.set_phase(CalibrationPhase.PHASE_4_COLOR_ANALYSIS)
+            phase = self.controller.get_current_phase()
+        self.phase_label.setText(_PHASE_LABELS[phase])
         self.action_label.setText(self.controller.get_next_action())
         self.tab_widget.setTabEnabled(2, True)
-        self.export_tab.update_ui_state(phase)
-        self.analysis_tab.update_ui_for_phase()
+        self.phaseChanged.emit(phase)
         
-        if phase == CalibrationPhase.PHASE_3_DRIVER_LOCK:
-            self.controller.set_phase(CalibrationPhase.PHASE_4_COLOR_ANALYSIS)
-            from PyQt6.QtCore import QTimer
-            QTimer.singleShot(0, self.update_status_display)
-        elif phase == CalibrationPhase.PHASE_5_ICC_CONSTRUCTION:
+        if phase == CalibrationPhase.PHASE_5_ICC_CONSTRUCTION:
             # Automatically switch to the Export Profile tab when ready to export
             self.tab_widget.setCurrentIndex(2)
         elif phase == CalibrationPhase.PHASE_6_VALIDATION:
@@ -447,13 +783,13 @@ class MainWindow(QMainWindow):
 
         # File Menu
         file_menu = menu_bar.addMenu("&File")
-        save_action = QAction("&Save Calibration", self)
-        save_action.triggered.connect(self.save_profile)
-        file_menu.addAction(save_action)
+        self.save_action = QAction("&Save Calibration", self)
+        self.save_action.triggered.connect(self.save_profile)
+        file_menu.addAction(self.save_action)
 
-        load_action = QAction("&Load Calibration", self)
-        load_action.triggered.connect(self.load_profile)
-        file_menu.addAction(load_action)
+        self.load_action = QAction("&Load Calibration", self)
+        self.load_action.triggered.connect(self.load_profile)
+        file_menu.addAction(self.load_action)
 
         file_menu.addSeparator()
 
@@ -475,26 +811,77 @@ class MainWindow(QMainWindow):
     def _create_advanced_menu(self):
         advanced_menu = self.menuBar().addMenu("&Advanced")
         
-        reset_action = QAction("Reset Calibration", self)
-        reset_action.triggered.connect(self.reset_calibration)
-        advanced_menu.addAction(reset_action)
+        self.reset_action = QAction("Reset Calibration", self)
+        self.reset_action.triggered.connect(self.reset_calibration)
+        advanced_menu.addAction(self.reset_action)
 
-        skip_menu = advanced_menu.addMenu("Skip to Phase...")
+        skip_menu = self.skip_menu = advanced_menu.addMenu("Skip to Phase...")
+        # One connection on the menu serves every skip action.
+        skip_menu.triggered.connect(self._on_skip_action_triggered)
         for phase in CalibrationPhase:
             if phase not in [CalibrationPhase.COMPLETE, CalibrationPhase.ERROR]:
-                action = QAction(str(phase), self)
-                action.triggered.connect(partial(self.skip_to_phase, phase))
+                action = QAction(_PHASE_LABELS[phase], self)
+                action.setData(phase)
                 skip_menu.addAction(action)
 
+        advanced_menu.addSeparator()
+        self.numba_action = QAction("Enable Numba JIT", self)
+        self.numba_action.setCheckable(True)
+        self.numba_action.toggled.connect(self._set_numba_enabled)
+        advanced_menu.addAction(self.numba_action)
+
+    def _set_numba_enabled(self, enabled: bool):
+        """Swaps the numeric helpers in _JIT_TARGETS for numba-compiled versions, or back."""
+        if not enabled:
+            for (module, name, _), func in zip(_JIT_TARGETS, self._jit_originals):
+                setattr(module, name, func)
+            self.results_text.append("Numba JIT disabled.")
+            return
+
+        try:
+            import numba
+        except ImportError:
+            QMessageBox.warning(self, "Numba Not Available", "Numba is not installed. Please install it using: pip install numba")
+            # Untick without re-entering this slot; there is nothing to restore.
+            with QSignalBlocker(self.numba_action):
+                self.numba_action.setChecked(False)
+            return
+
+        # Compile every target before swapping any in, so a failure leaves the
+        # original functions in place.
+        compiled = []
+        try:
+            for module, name, sample_args in _JIT_TARGETS:
+                func = getattr(module, name)
+                jitted = numba.njit(cache=True, fastmath=True)(func)
+                jitted(*sample_args)  # Compile now rather than on the first measurement
+                compiled.append((module, name, func, jitted))
+        except Exception as e:
+            QMessageBox.warning(self, "Numba Compilation Failed", f"Could not compile the numeric helpers with numba; they stay uncompiled:\n{e}")
+            with QSignalBlocker(self.numba_action):
+                self.numba_action.setChecked(False)
+            return
+
+        self._jit_originals = []
+        for module, name, func, jitted in compiled:
+            self._jit_originals.append(func)
+            setattr(module, name, jitted)
+        self.results_text.append("Numba JIT enabled.")
+
+    def _on_skip_action_triggered(self, action):
+        """Skips to the phase stored on the triggered 'Skip to Phase' action."""
+        self.skip_to_phase(action.data())
+
     def reset_calibration(self):
         self.controller.reset()
         self.results_text.clear()
         self.results_text.append("--- CALIBRATION RESET ---\n")
         self.analysis_tab.current_chart_type = None  # Force table clear
+        self.analysis_tab._last_phase = None
         self.update_status_display()
 
     def save_profile(self):
-        filepath, _ = QFileDialog.getSaveFileName(self, "Save Calibration Profile", "", "Calibration Profile (*.cal);;All Files (*)")
+        filepath = self.pick_file(QFileDialog.getSaveFileName, self, "Save Calibration Profile", "Calibration Profile (*.cal);;All Files (*)")
         if filepath:
             try:
                 self.controller.save_state(filepath)
@@ -503,7 +890,7 @@ class MainWindow(QMainWindow):
                 QMessageBox.critical(self, "Error", f"Failed to save calibration profile:\n{e}")
 
     def load_profile(self):
-        filepath, _ = QFileDialog.getOpenFileName(self, "Load Calibration Profile", "", "Calibration Profile (*.cal);;All Files (*)")
+        filepath = self.pick_file(QFileDialog.getOpenFileName, self, "Load Calibration Profile", "Calibration Profile (*.cal);;All Files (*)")
         if filepath:
             try:
                 loaded_controller = CalibrationController.load_state(filepath)
@@ -513,6 +900,7 @@ class MainWindow(QMainWindow):
                 # Ensure all tabs are updated with the new controller
                 self.analysis_tab.controller = self.controller
                 self.export_tab.controller = self.controller
+                self.analysis_tab._last_phase = None
                 self.analysis_tab.update_ui_for_phase()
                 self.tab_widget.setCurrentIndex(self.tab_widget.indexOf(self.analysis_tab)) # Switch to analysis tab after loading
                 
@@ -525,6 +913,12 @@ class MainWindow(QMainWindow):
         self.update_status_display()
 
     def show_instructions_dialog(self):
+        # The dialog is built on first use and kept, so the instructions HTML
+        # is only parsed and laid out once per session.
+        if self._instructions_dialog is not None:
+            self._instructions_dialog.exec()
+            return
+
         dialog = QDialog(self)
         dialog.setWindowTitle("Calibration Instructions")
         dialog.resize(800, 600)
@@ -637,6 +1031,7 @@ class MainWindow(QMainWindow):
             </p>"""
         )
         layout.addWidget(text_edit)
+        self._instructions_dialog = dialog
         
         dialog.exec()
 
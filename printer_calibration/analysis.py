@@ -4,25 +4,84 @@ This module implements utilities used by the calibration controller
 for analyzing measurement data and suggesting adjustments.
 """
 
+import functools
+import math
+import types
+
 import numpy as np
 import pandas as pd
-import colour
 
-from . import config
-from .deltae import delta_e
+from . import config, srgb
+from .deltae_numba import delta_e_matrix
 
 
 def get_patch_lab(df, patch_name):
     """Extract (L, a, b) values for a specific patch by name."""
-    patch = df[df["patch"] == patch_name]
-    if patch.empty:
+    # Locate the first match on the raw column rather than slicing out a sub-DataFrame.
+    matches = np.flatnonzero(df["patch"].to_numpy() == patch_name)
+    if matches.size == 0:
         return None
-    return tuple(patch[["L", "a", "b"]].iloc[0])
+    return tuple(df[["L", "a", "b"]].iloc[matches[0]])
+
+
+def _index_by_patch(df):
+    """Return the L, a, b columns indexed by patch name (first row per patch)."""
+    return df.drop_duplicates("patch").set_index("patch")[["L", "a", "b"]]
+
+
+def get_patch_labs(df, patch_names):
+    """Extract (L, a, b) values for several patches in one lookup.
+
+    Returns a list with one tuple per name, or None for names that are
+    not in `df`. Equivalent to calling :func:`get_patch_lab` per name.
+    """
+    labs = _index_by_patch(df)
+    values = labs.to_numpy()
+    return [
+        tuple(values[pos]) if pos >= 0 else None
+        for pos in labs.index.get_indexer(list(patch_names))
+    ]
+
+
+class PatchLabs:
+    """Lab values of one measurement, indexed by patch name.
+
+    Built once per measurement so that repeated lookups are dict hits
+    rather than scans of the DataFrame. As with :func:`get_patch_lab`, the
+    first row wins when a patch name appears more than once.
+    """
+
+    def __init__(self, df):
+        self.labs = df[["L", "a", "b"]].to_numpy(dtype=float)
+        names = df["patch"].to_numpy()
+        # Insert in reverse so the first occurrence of a name is kept.
+        self.index = dict(zip(names[::-1], range(len(names) - 1, -1, -1)))
+
+    def get(self, patch_name):
+        """Return the (L, a, b) tuple for `patch_name`, or None if absent."""
+        row = self.index.get(patch_name)
+        return None if row is None else tuple(self.labs[row].tolist())
 
 
 def get_lab_distance(lab1: tuple, lab2: tuple) -> float:
     """Calculates the Euclidean distance (Delta E 1976) between two Lab values."""
-    return np.sqrt((lab1[0] - lab2[0])**2 + (lab1[1] - lab2[1])**2 + (lab1[2] - lab2[2])**2)
+    # Plain scalar arithmetic: no temporaries, and still compilable when the
+    # GUI swaps this function for a numba-jitted copy.
+    dL = lab1[0] - lab2[0]
+    da = lab1[1] - lab2[1]
+    db = lab1[2] - lab2[2]
+    return math.sqrt(dL * dL + da * da + db * db)
+
+
+def get_lab_distances(labs_a, labs_b):
+    """Pairwise Delta E 1976 between two sets of Lab values.
+
+    Returns an array of shape (len(labs_a), len(labs_b)) whose ``[i, j]``
+    entry is ``get_lab_distance(labs_a[i], labs_b[j])``.
+    """
+    a = np.asarray(labs_a, dtype=float)
+    b = np.asarray(labs_b, dtype=float)
+    return np.sqrt(((a[:, None, :] - b[None, :, :]) ** 2).sum(axis=-1))
 
 
 def is_patch_within_target(patch_lab, targets):
@@ -35,6 +94,21 @@ def is_patch_within_target(patch_lab, targets):
     )
 
 
+# Ink-step counts (C, M, Y) for each direction of the a and b errors,
+# indexed [sign(a_err) + 1][sign(b_err) + 1] where the sign is 0 within
+# tolerance. Positive a (too red) adds cyan, negative a adds magenta;
+# positive b (too yellow) adds cyan and magenta, negative b adds yellow.
+_A_ERR_STEPS = {-1: (0, 1, 0), 0: (0, 0, 0), 1: (1, 0, 0)}
+_B_ERR_STEPS = {-1: (0, 0, 1), 0: (0, 0, 0), 1: (1, 1, 0)}
+_ADJUSTMENT_STEPS = tuple(
+    tuple(
+        tuple(x + y for x, y in zip(_A_ERR_STEPS[sa], _B_ERR_STEPS[sb]))
+        for sb in (-1, 0, 1)
+    )
+    for sa in (-1, 0, 1)
+)
+
+
 def suggest_adjustment(patch_lab, targets, steps):
     """Suggest per-channel ink adjustments from neutral errors for Phase 1."""
     _, a, b = patch_lab
@@ -46,42 +120,111 @@ def suggest_adjustment(patch_lab, targets, steps):
     a_err = a - a_target
     b_err = b - b_target
 
-    adj = {"C": 0, "M": 0, "Y": 0}
+    sa = int(a_err > a_tol) - int(a_err < -a_tol)
+    sb = int(b_err > b_tol) - int(b_err < -b_tol)
+    counts = _ADJUSTMENT_STEPS[sa + 1][sb + 1]
 
-    if a_err > a_tol:
-        adj["C"] += steps.fine
-    elif a_err < -a_tol:
-        adj["M"] += steps.fine
+    # Large errors switch every adjusted channel to a single coarse step.
+    if abs(a_err) > a_tol * 2 or abs(b_err) > b_tol * 2:
+        values = [steps.coarse if n else 0 for n in counts]
+    else:
+        values = [n * steps.fine for n in counts]
 
-    if b_err > b_tol:
-        adj["C"] += steps.fine
-        adj["M"] += steps.fine
-    elif b_err < -b_tol:
-        adj["Y"] += steps.fine
+    return dict(zip(("C", "M", "Y"), values))
 
-    if abs(a_err) > a_tol * 2 or abs(b_err) > b_tol * 2:
-        for channel, value in adj.items():
-            if value != 0:
-                adj[channel] = steps.coarse
 
-    return adj
+@functools.lru_cache(maxsize=1)
+def get_reference_lab_array() -> np.ndarray:
+    """
+    Returns the reference CIE-Lab values for config.COLOUR_PATCHES as a
+    read-only (N, 3) array in patch order. The patch table is constant, so
+    the conversion runs once and the result is cached.
+    """
+    # Convert sRGB to CIE-Lab for all patches in one call
+    # The conversion assumes standard sRGB primaries, D65 illuminant, and 2-degree observer,
+    # which is the standard for sRGB.
+    labs = srgb.srgb_u8_to_lab(config.COLOUR_PATCH_RGB_U8)
+    labs.flags.writeable = False
+    return labs
 
 
-def get_reference_lab_values() -> dict:
+@functools.lru_cache(maxsize=1)
+def get_reference_lab_values() -> types.MappingProxyType:
     """
-    Generates a dictionary of reference CIE-Lab values from the sRGB values
+    Generates a mapping of reference CIE-Lab values from the sRGB values
     in the config.COLOUR_PATCHES list.
+
+    The mapping is read-only and cached, like :func:`get_reference_lab_array`,
+    whose rows it refers to.
     """
-    # Normalize 8-bit RGB values to floating point 0.0-1.0
-    rgb_patches = {name: (r/255, g/255, b/255) for name, r, g, b in config.COLOUR_PATCHES}
+    return types.MappingProxyType(
+        dict(zip(config.COLOUR_PATCH_NAMES, get_reference_lab_array()))
+    )
 
-    # Convert sRGB to CIE-Lab
-    # The conversion assumes standard sRGB primaries, D65 illuminant, and 2-degree observer,
-    # which is the standard for sRGB.
-    lab_patches = {
-        name: colour.XYZ_to_Lab(colour.sRGB_to_XYZ(rgb)) for name, rgb in rgb_patches.items()
-    }
-    return lab_patches
+
+@functools.lru_cache(maxsize=8)
+def make_analyzer(targets: config.Phase4Targets):
+    """Return a Phase 4 analysis function specialised for `targets`.
+
+    The reference Lab array, the skin-tone mask and the thresholds are
+    bound once. The returned function takes measured Lab values as an
+    (N, 3) array in ``config.COLOUR_PATCH_NAMES`` order, plus an optional
+    boolean mask of the rows that were actually measured, and returns the
+    same ``(passed, report)`` pair as :func:`analyze_color_patches`.
+    Analyzers are cached per `targets`.
+    """
+    ref_lab = get_reference_lab_array()
+    skin_mask = pd.Index(config.COLOUR_PATCH_NAMES).isin(targets.skin_tone_set)
+    mean_target = targets.mean_delta_e
+    p95_target = targets.percentile_95_delta_e
+    max_target = targets.max_delta_e
+    skin_target = targets.skin_tone_delta_e
+
+    def analyze(measured, present=None):
+        if present is None:
+            ref, skin = ref_lab, skin_mask
+        elif not present.any():
+            return False, "No matching patches found between measurements and references."
+        else:
+            measured = measured[present]
+            ref, skin = ref_lab[present], skin_mask[present]
+
+        de_values = delta_e_matrix(measured, ref)
+        # Sort once and read all three statistics off the sorted values. The
+        # 95th percentile interpolates linearly, as np.percentile does.
+        sorted_de = np.sort(de_values)
+        mean_de = sorted_de.mean()
+        max_de = sorted_de[-1]
+        rank = 0.95 * (sorted_de.size - 1)
+        lo = int(rank)
+        hi = min(lo + 1, sorted_de.size - 1)
+        p95_de = sorted_de[lo] + (sorted_de[hi] - sorted_de[lo]) * (rank - lo)
+
+        max_skin_de = de_values[skin].max() if skin.any() else 0.0
+
+        # Check against targets
+        mean_ok = mean_de <= mean_target
+        p95_ok = p95_de <= p95_target
+        max_ok = max_de <= max_target
+        skin_ok = max_skin_de <= skin_target
+
+        passed = all([mean_ok, p95_ok, max_ok, skin_ok])
+
+        def _check(v): return "✅" if v else "❌"
+
+        report = (
+            f"--- Phase 4 Colour Analysis ---\n"
+            f"{_check(passed)} Overall Result: {'PASSED' if passed else 'FAILED'}\n\n"
+            f"CIEDE2000 Statistics:\n"
+            f"  {_check(mean_ok)} Mean ΔE:   {mean_de:.2f} (Target: ≤ {mean_target})\n"
+            f"  {_check(p95_ok)} 95th % ΔE: {p95_de:.2f} (Target: ≤ {p95_target})\n"
+            f"  {_check(max_ok)} Max ΔE:    {max_de:.2f} (Target: ≤ {max_target})\n"
+            f"  {_check(skin_ok)} Skin Tones ΔE: {max_skin_de:.2f} (Target: ≤ {skin_target})\n"
+        )
+
+        return passed, report
+
+    return analyze
 
 
 def analyze_color_patches(df: pd.DataFrame, targets: config.Phase4Targets) -> tuple[bool, str]:
@@ -89,45 +232,11 @@ def analyze_color_patches(df: pd.DataFrame, targets: config.Phase4Targets) -> tu
     Analyzes the full color chart measurements against reference values.
     Computes Delta E (CIEDE2000) statistics and checks against Phase 4 targets.
     """
-    reference_labs = get_reference_lab_values()
-    measured_patches = {row['patch']: (row['L'], row['a'], row['b']) for _, row in df.iterrows()}
-
-    delta_es = {}
-    for name, measured_lab in measured_patches.items():
-        if name in reference_labs:
-            ref_lab = reference_labs[name]
-            delta_es[name] = delta_e(measured_lab, ref_lab)
-
-    if not delta_es:
-        return False, "No matching patches found between measurements and references."
-
-    de_values = np.array(list(delta_es.values()))
-    mean_de = np.mean(de_values)
-    p95_de = np.percentile(de_values, 95)
-    max_de = np.max(de_values)
-    
-    skin_patches = [name for name in delta_es if name in targets.skin_tone_names]
-    skin_de_values = [delta_es[name] for name in skin_patches]
-    max_skin_de = max(skin_de_values) if skin_de_values else 0.0
-
-    # Check against targets
-    mean_ok = mean_de <= targets.mean_delta_e
-    p95_ok = p95_de <= targets.percentile_95_delta_e
-    max_ok = max_de <= targets.max_delta_e
-    skin_ok = max_skin_de <= targets.skin_tone_delta_e
-
-    passed = all([mean_ok, p95_ok, max_ok, skin_ok])
-
-    def _check(v): return "✅" if v else "❌"
-
-    report = (
-        f"--- Phase 4 Colour Analysis ---\n"
-        f"{_check(passed)} Overall Result: {'PASSED' if passed else 'FAILED'}\n\n"
-        f"CIEDE2000 Statistics:\n"
-        f"  {_check(mean_ok)} Mean ΔE:   {mean_de:.2f} (Target: ≤ {targets.mean_delta_e})\n"
-        f"  {_check(p95_ok)} 95th % ΔE: {p95_de:.2f} (Target: ≤ {targets.percentile_95_delta_e})\n"
-        f"  {_check(max_ok)} Max ΔE:    {max_de:.2f} (Target: ≤ {targets.max_delta_e})\n"
-        f"  {_check(skin_ok)} Skin Tones ΔE: {max_skin_de:.2f} (Target: ≤ {targets.skin_tone_delta_e})\n"
-    )
-
-    return passed, report
+    # Align measurements to the reference patch order; later duplicates win.
+    # Patches that are missing or incompletely measured are left out.
+    measured = df.set_index(df['patch'].astype(str))[['L', 'a', 'b']]
+    measured = measured[~measured.index.duplicated(keep='last')]
+    aligned = measured.reindex(config.COLOUR_PATCH_NAMES).to_numpy(dtype=float)
+    present = ~np.isnan(aligned).any(axis=1)
+
+    return make_analyzer(targets)(aligned, present)
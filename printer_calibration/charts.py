@@ -6,11 +6,15 @@ subsequent measurement. It provides a neutral grayscale chart and a
 colour patch chart generator. Both functions save images via Pillow's
 ``Image.save`` and therefore can output common formats (PNG, JPEG)
 and PDF (either by using a ``.pdf`` filename or by passing
-``format='PDF'``).
+``format='PDF'``). The ``render_*`` functions return the image without
+saving it, for writing one chart to several files with :func:`save_chart`.
 """
 
+import functools
+
+import numpy as np
 from PIL import Image, ImageDraw, ImageFont
-from printer_calibration.config import COLOUR_PATCHES
+from printer_calibration.config import COLOUR_PATCHES, COLOUR_PATCH_NAMES, COLOUR_PATCH_RGB_U8
 import csv
 
 A4_MM = (210, 297)
@@ -18,14 +22,15 @@ A4_MM = (210, 297)
 
 def write_measurement_template(patches, filename="measurements_template.csv"):
     try:
-        with open(filename, "w", newline="") as f:
+        with open(filename, "w", newline="", buffering=1 << 16) as f:
             writer = csv.writer(f)
             writer.writerow(
                 ["index", "label", "r", "g", "b", "L", "a", "b_lab"]
             )
-
-            for idx, (label, r, g, b) in enumerate(patches, start=1):
-                writer.writerow([idx, label, r, g, b, "", "", ""])
+            writer.writerows(
+                [idx, label, r, g, b, "", "", ""]
+                for idx, (label, r, g, b) in enumerate(patches, start=1)
+            )
     except (IOError, PermissionError) as e:
         raise IOError(
             f"Failed to write to {filename}. Please ensure the file is not open "
@@ -38,41 +43,86 @@ def _px(mm, dpi):
     return int(mm / 25.4 * dpi)
 
 
-def generate_neutral_chart(path, dpi=300, title=None, format=None):
-    """Generate a neutral (grayscale) patch chart and save to `path`.
+@functools.lru_cache(maxsize=32)
+def _load_font(preferred_sizes=(24, 12)):
+    """Return the first loadable font for the given pixel sizes.
+
+    Tries common TTF fonts, falling back to Pillow's bundled DejaVu or
+    finally to the small default bitmap font. Results are cached, so
+    repeated charts do not reopen the font files.
+    """
+    candidates = ["arial.ttf", "DejaVuSans.ttf"]
+    for size in preferred_sizes:
+        for name in candidates:
+            try:
+                return ImageFont.truetype(name, size)
+            except OSError:
+                continue
+    return ImageFont.load_default()
+
+
+def _load_font_pt(preferred_sizes_pt, dpi):
+    """Like :func:`_load_font`, with sizes given in points at `dpi`."""
+    return _load_font(tuple(int(size_pt * dpi / 72) for size_pt in preferred_sizes_pt))
+
+
+def page_canvas(dpi=300, canvas=None):
+    """Return a white A4 page buffer of shape (height, width, 3) at `dpi`.
+
+    If `canvas` already has that shape it is cleared and reused instead of
+    allocating a new buffer, so several charts can be rendered into one.
+    """
+    shape = (_px(A4_MM[1], dpi), _px(A4_MM[0], dpi), 3)
+    if canvas is not None and canvas.shape == shape and canvas.dtype == np.uint8:
+        canvas[...] = 255
+        return canvas
+    return np.full(shape, 255, dtype=np.uint8)
+
+
+def save_chart(img, path, format=None, dpi=None):
+    """Save a rendered chart image to `path`.
 
     Parameters
     ----------
-    path : str
-        Output filename for the generated image (extension determines
-        the format if ``format`` is not provided).
-    dpi : int
-        Target pixels-per-inch for the output image.
-    title : str | None
-        Optional title to render centered at the top of the page.
+    img : PIL.Image.Image
+        Image returned by one of the ``render_*`` functions.
+    path : str | file-like
+        Output filename (extension determines the format if ``format``
+        is not provided), or a binary file object such as
+        :class:`io.BytesIO`, in which case ``format`` is required.
     format : str | None
-        Optional explicit image format passed to Pillow's ``save`` call
-        (for example, ``'PDF'`` to force PDF output).
+        Optional explicit image format passed to Pillow's ``save`` call.
+    dpi : int | None
+        Optional resolution to record in the saved file.
     """
-    width, height = _px(A4_MM[0], dpi), _px(A4_MM[1], dpi)
-    img = Image.new("RGB", (width, height), "white")
-    draw = ImageDraw.Draw(img)
+    options = {"dpi": (dpi, dpi)} if dpi else {}
+    try:
+        if format:
+            img.save(path, format=format, **options)
+        else:
+            img.save(path, **options)
+    except (IOError, PermissionError, ValueError) as e:
+        raise IOError(
+            f"Failed to save chart to {path}. Please ensure the file is not open "
+            f"in another program, that you have the necessary permissions, and "
+            f"that the format is supported."
+        ) from e
+
+
+def render_neutral_chart(dpi=300, title=None, canvas=None):
+    """Render the neutral (grayscale) patch chart and return it as an image.
+
+    Rendering is separate from saving so the same image can be written
+    to several files without drawing it again; see :func:`save_chart`.
+    An optional `canvas` from :func:`page_canvas` is reused as the page
+    buffer.
+    """
+    pixels = page_canvas(dpi, canvas)
+    height, width = pixels.shape[:2]
 
     cols, rows = 4, 7
     margin, gap = 40, 20
 
-    def _load_font(preferred_sizes=(24,12,)):
-        # Try common TTF fonts, falling back to Pillow's bundled DejaVu
-        # or finally to the small default bitmap font.
-        candidates = ["arial.ttf", "DejaVuSans.ttf"]
-        for size in preferred_sizes:
-            for name in candidates:
-                try:
-                    return ImageFont.truetype(name, size)
-                except OSError:
-                    continue
-        return ImageFont.load_default()
-
     font = _load_font((24,))
 
     # Provide a sensible default title when none is supplied
@@ -84,7 +134,7 @@ def generate_neutral_chart(path, dpi=300, title=None, format=None):
     if title:
         # prefer a larger title font; try common TTFs first
         title_font = _load_font((48, 36))
-        tb = draw.textbbox((0, 0), title, font=title_font)
+        tb = title_font.getbbox(title)
         title_height = tb[3] - tb[1]
         # add a little spacing below the title
         margin += title_height + 10
@@ -92,13 +142,6 @@ def generate_neutral_chart(path, dpi=300, title=None, format=None):
     pw = (width - 2 * margin - (cols - 1) * gap) // cols
     ph = (height - 2 * margin - (rows - 1) * gap) // rows
 
-    # Draw title after layout so it appears above the chart
-    if title:
-        tw = tb[2] - tb[0]
-        x_pos = (width - tw) / 2
-        y_pos = (margin - title_height - 10) / 2
-        draw.text((x_pos, y_pos), title, fill="black", font=title_font)
-
     # Centre the grid horizontally by computing the grid width and
     # choosing an x-origin so left/right margins are equal.
     grid_width = cols * pw + (cols - 1) * gap
@@ -107,12 +150,26 @@ def generate_neutral_chart(path, dpi=300, title=None, format=None):
     values = sorted(
         list(set([0, 5, 100, 150, 200, 255] + list(range(0, 256, 10))))
     )
+    positions = [
+        (x_origin + c * (pw + gap), margin + r * (ph + gap))
+        for r, c in (divmod(i, cols) for i in range(len(values)))
+    ]
+
+    # Fill the patches directly in the page buffer; Pillow only draws the
+    # text. Rectangle bounds are inclusive, as with ImageDraw.rectangle.
+    for v, (x, y) in zip(values, positions):
+        pixels[y:y + ph + 1, x:x + pw + 1] = v
+    img = Image.fromarray(pixels, "RGB")
+    draw = ImageDraw.Draw(img)
+
+    # Draw title after layout so it appears above the chart
+    if title:
+        tw = tb[2] - tb[0]
+        x_pos = (width - tw) / 2
+        y_pos = (margin - title_height - 10) / 2
+        draw.text((x_pos, y_pos), title, fill="black", font=title_font)
 
-    for i, v in enumerate(values):
-        r, c = divmod(i, cols)
-        x = x_origin + c * (pw + gap)
-        y = margin + r * (ph + gap)
-        draw.rectangle([x, y, x + pw, y + ph], fill=(v, v, v))
+    for v, (x, y) in zip(values, positions):
         label = str(v)
         # Use textbbox for Pillow 10+ compatibility (textsize is deprecated)
         bbox = draw.textbbox((0, 0), label, font=font)
@@ -120,51 +177,43 @@ def generate_neutral_chart(path, dpi=300, title=None, format=None):
         th = bbox[3] - bbox[1]
         draw.text((x + (pw - tw) / 2, y - th - 5), label, fill="black", font=font)
 
-    try:
-        if format:
-            img.save(path, format=format)
-        else:
-            img.save(path)
-    except (IOError, PermissionError, ValueError) as e:
-        raise IOError(
-            f"Failed to save chart to {path}. Please ensure the file is not open "
-            f"in another program, that you have the necessary permissions, and "
-            f"that the format is supported."
-        ) from e
+    return img
 
 
-def generate_colour_chart(
-    path: str = "colour_test_A4.png",
-    dpi=300,
-    patch_size_mm=35,
-    margin_mm=10,
-    title=None,
-    format=None,
-):
-    # Not happy with hardcoding the filename
-    write_measurement_template(COLOUR_PATCHES)
+def generate_neutral_chart(path, dpi=300, title=None, format=None):
+    """Generate a neutral (grayscale) patch chart and save to `path`.
 
-    width, height = _px(A4_MM[0], dpi), _px(A4_MM[1], dpi)
-    img = Image.new("RGB", (width, height), "white")
-    draw = ImageDraw.Draw(img)
+    Parameters
+    ----------
+    path : str | file-like
+        Output filename for the generated image (extension determines
+        the format if ``format`` is not provided), or a binary file
+        object together with ``format``.
+    dpi : int
+        Target pixels-per-inch for the output image.
+    title : str | None
+        Optional title to render centered at the top of the page.
+    format : str | None
+        Optional explicit image format passed to Pillow's ``save`` call
+        (for example, ``'PDF'`` to force PDF output).
+    """
+    save_chart(render_neutral_chart(dpi=dpi, title=title), path, format=format)
+
+
+def render_colour_chart(dpi=300, patch_size_mm=35, margin_mm=10, title=None, canvas=None):
+    """Render the colour patch chart and return it as an image.
+
+    See :func:`render_neutral_chart`; the measurement template is only
+    written by :func:`generate_colour_chart`.
+    """
+    pixels = page_canvas(dpi, canvas)
+    height, width = pixels.shape[:2]
 
     patch_size = _px(patch_size_mm, dpi)
     margin = _px(margin_mm, dpi)
 
     cols = 4
 
-    # Prepare fonts. Use a readable TTF when available, fall back to default.
-    def _load_font(preferred_sizes_pt=(12,)):
-        candidates = ["arial.ttf", "DejaVuSans.ttf"]
-        for size_pt in preferred_sizes_pt:
-            size_px = int(size_pt * dpi / 72)
-            for name in candidates:
-                try:
-                    return ImageFont.truetype(name, size_px)
-                except OSError:
-                    continue
-        return ImageFont.load_default()
-
     # Provide a sensible default title when none is supplied
     if not title:
         title = "Colour Test Chart"
@@ -173,12 +222,10 @@ def generate_colour_chart(
     title_height = 0
     top_margin = margin
     if title:
-        title_font = _load_font((36, 24))
-        tb = draw.textbbox((0, 0), title, font=title_font)
+        title_font = _load_font_pt((36, 24), dpi)
+        tb = title_font.getbbox(title)
         title_height = tb[3] - tb[1]
-        x_pos = (width - (tb[2] - tb[0])) / 2
-        y_pos = top_margin
-        draw.text((x_pos, y_pos), title, fill="black", font=title_font)
+        title_pos = ((width - (tb[2] - tb[0])) / 2, top_margin)
         top_margin += title_height + _px(10, dpi) # add 10mm space after title
 
     # Centre the grid horizontally: compute available grid width and origin
@@ -186,7 +233,8 @@ def generate_colour_chart(
     x0 = (width - grid_width) // 2
     y0 = top_margin
 
-    for idx, (label, r, g, b) in enumerate(COLOUR_PATCHES):
+    positions = []
+    for idx in range(len(COLOUR_PATCH_NAMES)):
         row = idx // cols
         col = idx % cols
 
@@ -195,17 +243,28 @@ def generate_colour_chart(
 
         if y + patch_size > height: # Avoid drawing off-page
             break
+        positions.append((x, y))
+
+    # Fill the patches and their 1px black outlines directly in the page
+    # buffer; Pillow only draws the text. Bounds are inclusive, as with
+    # ImageDraw.rectangle.
+    for (x, y), rgb in zip(positions, COLOUR_PATCH_RGB_U8):
+        x1, y1 = x + patch_size, y + patch_size
+        pixels[y:y1 + 1, x:x1 + 1] = rgb
+        pixels[[y, y1], x:x1 + 1] = 0
+        pixels[y:y1 + 1, [x, x1]] = 0
+    img = Image.fromarray(pixels, "RGB")
+    draw = ImageDraw.Draw(img)
 
-        draw.rectangle(
-            [x, y, x + patch_size, y + patch_size],
-            fill=(r, g, b),
-            outline="black",
-        )
+    if title:
+        draw.text(title_pos, title, fill="black", font=title_font)
 
-        # Add a sequence number and label with readable sizes
-        seq_font = _load_font((10,))
-        lbl_font = _load_font((8,))
+    patches = zip(COLOUR_PATCH_NAMES, COLOUR_PATCH_RGB_U8.tolist())
+    # Sequence numbers and labels use readable sizes
+    seq_font = _load_font_pt((10,), dpi)
+    lbl_font = _load_font_pt((8,), dpi)
 
+    for idx, ((x, y), (label, (r, g, b))) in enumerate(zip(positions, patches)):
         # position labels above the patch
         label_y_offset = _px(3, dpi) # 3mm
         seq_label_y_offset = _px(6, dpi) # 6mm
@@ -215,14 +274,21 @@ def generate_colour_chart(
             draw.text((x, y - seq_label_y_offset), f"#{idx + 1}", fill="black", font=seq_font)
             draw.text((x, y - label_y_offset), f"{label} ({r},{g},{b})", fill="black", font=lbl_font)
 
-    try:
-        if format:
-            img.save(path, format=format, dpi=(dpi, dpi))
-        else:
-            img.save(path, dpi=(dpi, dpi))
-    except (IOError, PermissionError, ValueError) as e:
-        raise IOError(
-            f"Failed to save chart to {path}. Please ensure the file is not open "
-            f"in another program, that you have the necessary permissions, and "
-            f"that the format is supported."
-        ) from e
+    return img
+
+
+def generate_colour_chart(
+    path: str = "colour_test_A4.png",
+    dpi=300,
+    patch_size_mm=35,
+    margin_mm=10,
+    title=None,
+    format=None,
+):
+    # Not happy with hardcoding the filename
+    write_measurement_template(COLOUR_PATCHES)
+
+    img = render_colour_chart(
+        dpi=dpi, patch_size_mm=patch_size_mm, margin_mm=margin_mm, title=title
+    )
+    save_chart(img, path, format=format, dpi=dpi)
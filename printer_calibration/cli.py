@@ -66,7 +66,7 @@ def build_parser() -> argparse.ArgumentParser:
     gen.add_argument(
         "--format",
         dest="format",
-        help="Explicit image format to pass to Pillow (e.g. 'PDF')",
+        help="Explicit image format to pass to Pillow (e.g. 'PDF'); with --all, a comma-separated list such as 'PNG,PDF'",
     )
     gen.add_argument(
         "--title",
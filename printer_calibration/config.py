@@ -7,8 +7,11 @@ and step sizes for suggested adjustments.
 """
 
 from dataclasses import dataclass
+from functools import cached_property
 from typing import Tuple
 
+import numpy as np
+
 
 @dataclass(frozen=True)
 class Phase1Targets:
@@ -43,6 +46,11 @@ class Phase4Targets:
     skin_tone_delta_e: float = 12.0
     skin_tone_names: Tuple[str, ...] = ("Skin1", "Skin2")
 
+    @cached_property
+    def skin_tone_set(self) -> frozenset:
+        """``skin_tone_names`` as a frozenset, for membership tests."""
+        return frozenset(self.skin_tone_names)
+
 
 @dataclass(frozen=True)
 class Convergence:
@@ -102,3 +110,9 @@ COLOUR_PATCHES = [
     ("Sky", 135, 206, 235),
     ("Leaf", 34, 139, 34),
 ]
+
+# Structure-of-arrays view of COLOUR_PATCHES: names in patch order, and the
+# 8-bit RGB values as a read-only (N, 3) uint8 array for vectorized use.
+COLOUR_PATCH_NAMES: Tuple[str, ...] = tuple(name for name, _, _, _ in COLOUR_PATCHES)
+COLOUR_PATCH_RGB_U8 = np.array([(r, g, b) for _, r, g, b in COLOUR_PATCHES], dtype=np.uint8)
+COLOUR_PATCH_RGB_U8.flags.writeable = False
@@ -5,7 +5,9 @@ calibration sequence, guiding the user through the process from
 initial checks to final ICC profile generation.
 """
 from enum import Enum, auto
+import math
 import numpy as np
+import pandas as pd
 from . import analysis, config, icc
 
 
@@ -30,10 +32,36 @@ class CalibrationPhase(Enum):
 class CalibrationController:
     """Manages the state and flow of the printer calibration process."""
 
+    # Next-action text per phase; {patch} and {error} are filled in by
+    # get_next_action.
+    _ACTION_TEMPLATES = {
+        CalibrationPhase.PRECONDITION:
+            "Verify preconditions (paper, ink, settings) and measure the neutral patches chart.",
+        CalibrationPhase.PHASE_1_NEUTRAL_GREY:
+            "Calibrating mid-grey anchor ({patch}). "
+            "Apply the suggested adjustments and re-measure the neutral patches chart.",
+        CalibrationPhase.PHASE_2_NEUTRAL_SLOPE:
+            "Mid-grey anchor is calibrated. Now validating neutral slope with the same measurement data. No adjustments needed.",
+        CalibrationPhase.PHASE_3_DRIVER_LOCK:
+            "Driver adjustments are now locked. Do not change any driver color settings. "
+            "Next, print and measure the full colour chart for analysis.",
+        CalibrationPhase.PHASE_4_COLOR_ANALYSIS:
+            "Analyzing full colour chart. This checks if the printer is within tolerance for ICC profiling.",
+        CalibrationPhase.PHASE_5_ICC_CONSTRUCTION:
+            "Printer is within tolerance. Go to the 'Export Profile' tab to save the ICC profile.",
+        CalibrationPhase.PHASE_6_VALIDATION:
+            "Profile exported. Now print the colour chart WITH the profile applied, measure it, and process here to validate.",
+        CalibrationPhase.COMPLETE:
+            "Calibration is complete! ICC Profile has been generated.",
+        CalibrationPhase.ERROR:
+            "An error occurred: {error}"
+    }
+
     def __init__(self):
         self.phase = CalibrationPhase.PRECONDITION
-        # History stores tuples of (measurement_df, adjustment_dict) for each step in phase 1
+        # History stores tuples of (phase 1 patch Lab tuple, adjustment_dict) for each step in phase 1
         self.history = []
+        self._labs = None # PatchLabs of the measurement being processed
         self.last_error_message = ""
         self.last_measurements_df = None # To store df from successful phase 4
         # Load configs
@@ -42,6 +70,19 @@ class CalibrationController:
 
         self.convergence_rules = config.Convergence()
         self.ink_steps = config.InkSteps()
+        self._init_caches()
+
+    def _init_caches(self):
+        """Precomputes values derived from the (immutable) phase targets."""
+        a_range = self.phase1_targets.a_range
+        b_range = self.phase1_targets.b_range
+        self._p1_a_target = 0.5 * (a_range[0] + a_range[1])
+        self._p1_b_target = 0.5 * (b_range[0] + b_range[1])
+        # a*, b* tolerances for the RGB150 and RGB200 patches, one row each.
+        self._p2_ab_tol = np.array([
+            [self.phase2_targets.rgb150_a_tol, self.phase2_targets.rgb150_b_tol],
+            [self.phase2_targets.rgb200_a_tol, self.phase2_targets.rgb200_b_tol],
+        ])
 
     def get_current_phase(self) -> CalibrationPhase:
         """Returns the current calibration phase."""
@@ -49,55 +90,39 @@ class CalibrationController:
 
     def get_next_action(self) -> str:
         """Determines the next action for the user based on the current phase."""
-        actions = {
-            CalibrationPhase.PRECONDITION:
-                "Verify preconditions (paper, ink, settings) and measure the neutral patches chart.",
-            CalibrationPhase.PHASE_1_NEUTRAL_GREY:
-                f"Calibrating mid-grey anchor ({self.phase1_targets.patch_name}). "
-                "Apply the suggested adjustments and re-measure the neutral patches chart.",
-            CalibrationPhase.PHASE_2_NEUTRAL_SLOPE:
-                "Mid-grey anchor is calibrated. Now validating neutral slope with the same measurement data. No adjustments needed.",
-            CalibrationPhase.PHASE_3_DRIVER_LOCK:
-                "Driver adjustments are now locked. Do not change any driver color settings. "
-                "Next, print and measure the full colour chart for analysis.",
-            CalibrationPhase.PHASE_4_COLOR_ANALYSIS:
-                "Analyzing full colour chart. This checks if the printer is within tolerance for ICC profiling.",
-            CalibrationPhase.PHASE_5_ICC_CONSTRUCTION:
-                "Printer is within tolerance. Go to the 'Export Profile' tab to save the ICC profile.",
-            CalibrationPhase.PHASE_6_VALIDATION:
-                "Profile exported. Now print the colour chart WITH the profile applied, measure it, and process here to validate.",
-            CalibrationPhase.COMPLETE:
-                "Calibration is complete! ICC Profile has been generated.",
-            CalibrationPhase.ERROR:
-                f"An error occurred: {self.last_error_message}"
-        }
-        return actions.get(self.phase, "Calibration process is in an unhandled state.")
+        template = self._ACTION_TEMPLATES.get(
+            self.phase, "Calibration process is in an unhandled state."
+        )
+        return template.format(
+            patch=self.phase1_targets.patch_name, error=self.last_error_message
+        )
 
     def process_measurements(self, df):
-        """Processes measurement data, provides suggestions, and updates the phase."""
+        """Processes measurement data, provides suggestions, and updates the phase.
+
+        ``df`` is a DataFrame with 'patch', 'L', 'a' and 'b' columns, or a
+        sequence of per-patch dicts with the same keys.
+        """
+        if not isinstance(df, pd.DataFrame):
+            df = pd.DataFrame.from_records(df)
+        # Index the Lab values once; the phase handlers look patches up in it.
+        self._labs = analysis.PatchLabs(df)
         if self.phase == CalibrationPhase.PRECONDITION:
             self.phase = CalibrationPhase.PHASE_1_NEUTRAL_GREY
             # Fall through to immediately process the first measurement in Phase 1
 
-        if self.phase == CalibrationPhase.PHASE_1_NEUTRAL_GREY:
-            return self._process_phase1(df)
-        elif self.phase == CalibrationPhase.PHASE_2_NEUTRAL_SLOPE:
-             # Phase 2 uses the same data as the final step of phase 1
-            return self._process_phase2(df)
-        elif self.phase == CalibrationPhase.PHASE_4_COLOR_ANALYSIS:
-            return self._process_phase4(df)
-        elif self.phase == CalibrationPhase.PHASE_6_VALIDATION:
-            return self._process_phase6(df)
-        elif self.phase in [CalibrationPhase.PHASE_3_DRIVER_LOCK, CalibrationPhase.COMPLETE, CalibrationPhase.PHASE_5_ICC_CONSTRUCTION]:
+        handler = self._PHASE_HANDLERS.get(self.phase)
+        if handler is not None:
+            return handler(self, df)
+        if self.phase in self._LOCKED_PHASES:
             self.last_error_message = "Driver adjustments are locked. No further measurements can be processed for tuning."
             return self.last_error_message
-        else:
-            return "No processing action defined for the current phase."
+        return "No processing action defined for the current phase."
 
     def _process_phase1(self, df):
         """Handles the logic for Phase 1: mid-grey anchor calibration."""
         patch_name = self.phase1_targets.patch_name
-        patch_lab = analysis.get_patch_lab(df, patch_name)
+        patch_lab = self._lab(patch_name)
 
         if patch_lab is None:
             self.last_error_message = f"Patch '{patch_name}' not found in measurement data."
@@ -108,8 +133,7 @@ class CalibrationController:
         is_converged = False
 
         if self.history:
-            prev_df, _ = self.history[-1]
-            prev_lab = analysis.get_patch_lab(prev_df, patch_name)
+            prev_lab, _ = self.history[-1]
 
             if prev_lab and analysis.get_lab_distance(patch_lab, prev_lab) < self.convergence_rules.min_abs_change:
                 is_converged = True
@@ -122,7 +146,7 @@ class CalibrationController:
 
         if is_converged:
             if is_within_target:
-                self.history.append((df, {}))
+                self.history.append((patch_lab, {}))
                 self.phase = CalibrationPhase.PHASE_2_NEUTRAL_SLOPE
                 return self._process_phase2(df)
             else:
@@ -130,7 +154,7 @@ class CalibrationController:
                 return "Phase 1 Converged but outside target. This may indicate driver limitations. Freezing adjustments."
 
         adjustment = analysis.suggest_adjustment(patch_lab, self.phase1_targets, self.ink_steps)
-        self.history.append((df, adjustment))
+        self.history.append((patch_lab, adjustment))
 
         if not adjustment:
             if is_within_target:
@@ -149,33 +173,26 @@ class CalibrationController:
         p2_150_name = self.phase2_targets.rgb150_patch_name
         p2_200_name = self.phase2_targets.rgb200_patch_name
 
-        p1_lab = analysis.get_patch_lab(df, p1_patch_name)
-        p150_lab = analysis.get_patch_lab(df, p2_150_name)
-        p200_lab = analysis.get_patch_lab(df, p2_200_name)
+        p1_lab = self._lab(p1_patch_name)
+        p150_lab = self._lab(p2_150_name)
+        p200_lab = self._lab(p2_200_name)
 
         if not all([p1_lab, p150_lab, p200_lab]):
             self.last_error_message = f"One or more neutral patches ({p1_patch_name}, {p2_150_name}, {p2_200_name}) are missing."
             self.phase = CalibrationPhase.ERROR
             return self.last_error_message
 
-        p150_ok = (abs(p150_lab[1]) <= self.phase2_targets.rgb150_a_tol and
-                   abs(p150_lab[2]) <= self.phase2_targets.rgb150_b_tol)
-        p200_ok = (abs(p200_lab[1]) <= self.phase2_targets.rgb200_a_tol and
-                   abs(p200_lab[2]) <= self.phase2_targets.rgb200_b_tol)
+        # a*, b* of the RGB100, RGB150 and RGB200 patches, one row each.
+        ab = np.array([p1_lab, p150_lab, p200_lab], dtype=float)[:, 1:]
 
-        if not (p150_ok and p200_ok):
+        if not (np.abs(ab[1:]) <= self._p2_ab_tol).all():
             self.last_error_message = "Neutral slope validation failed. RGB150 or RGB200 are outside tolerance."
             self.phase = CalibrationPhase.ERROR
             return self.last_error_message
 
-        p1_a_err, p1_b_err = p1_lab[1], p1_lab[2]
-        p150_a_err, p150_b_err = p150_lab[1], p150_lab[2]
-        p200_a_err, p200_b_err = p200_lab[1], p200_lab[2]
-
-        if np.sign(p1_a_err) * np.sign(p150_a_err) < 0 or \
-           np.sign(p150_a_err) * np.sign(p200_a_err) < 0 or \
-           np.sign(p1_b_err) * np.sign(p150_b_err) < 0 or \
-           np.sign(p150_b_err) * np.sign(p200_b_err) < 0:
+        # The a* and b* errors must not change sign from one patch to the next.
+        signs = np.sign(ab)
+        if (signs[:-1] * signs[1:] < 0).any():
             self.last_error_message = "Neutral slope is not monotonic. Indicates driver limits."
             self.phase = CalibrationPhase.PHASE_3_DRIVER_LOCK
             return f"{self.last_error_message} Freezing driver adjustments."
@@ -210,6 +227,21 @@ class CalibrationController:
             
         return report
 
+    # Measurement handler for each phase that accepts measurements. Phase 2
+    # uses the same data as the final step of phase 1.
+    _PHASE_HANDLERS = {
+        CalibrationPhase.PHASE_1_NEUTRAL_GREY: _process_phase1,
+        CalibrationPhase.PHASE_2_NEUTRAL_SLOPE: _process_phase2,
+        CalibrationPhase.PHASE_4_COLOR_ANALYSIS: _process_phase4,
+        CalibrationPhase.PHASE_6_VALIDATION: _process_phase6,
+    }
+    # Phases in which the driver settings are frozen.
+    _LOCKED_PHASES = frozenset({
+        CalibrationPhase.PHASE_3_DRIVER_LOCK,
+        CalibrationPhase.COMPLETE,
+        CalibrationPhase.PHASE_5_ICC_CONSTRUCTION,
+    })
+
     def export_icc(self, filename: str) -> str:
         """Exports the ICC profile if in the correct phase."""
         if self.phase not in [CalibrationPhase.PHASE_5_ICC_CONSTRUCTION, CalibrationPhase.PHASE_6_VALIDATION, CalibrationPhase.COMPLETE]:
@@ -232,16 +264,18 @@ class CalibrationController:
 
     def _get_phase1_error(self, patch_lab: tuple) -> float:
         """Calculates a simple scalar error for Phase 1 in the a*b* plane."""
-        a_target = np.mean(self.phase1_targets.a_range)
-        b_target = np.mean(self.phase1_targets.b_range)
-        return np.sqrt((patch_lab[1] - a_target)**2 + (patch_lab[2] - b_target)**2)
+        return math.hypot(patch_lab[1] - self._p1_a_target, patch_lab[2] - self._p1_b_target)
 
     def get_rgb100_lab(self):
         """Convenience method to get the last measured RGB100 Lab values."""
         if not self.history:
             return None
-        last_df, _ = self.history[-1]
-        return analysis.get_patch_lab(last_df, self.phase1_targets.patch_name)
+        last_lab, _ = self.history[-1]
+        return last_lab
+
+    def _lab(self, patch_name):
+        """Returns the Lab values of `patch_name` in the current measurement, or None."""
+        return self._labs.get(patch_name)
 
     def set_phase(self, phase: CalibrationPhase):
         """
@@ -263,6 +297,21 @@ class CalibrationController:
         with open(filepath, 'wb') as f:
             pickle.dump(self, f)
 
+    def __setstate__(self, state):
+        """Restores a pickled controller, upgrading states saved by older versions.
+
+        Older profiles kept the raw measurement DataFrame in the Phase 1
+        history; those entries are reduced to the Phase 1 patch's Lab values.
+        """
+        self.__dict__.update(state)
+        self.__dict__.setdefault("_labs", None)
+        self._init_caches()
+        patch_name = self.phase1_targets.patch_name
+        self.history = [
+            (analysis.get_patch_lab(lab, patch_name) if isinstance(lab, pd.DataFrame) else lab, adjustment)
+            for lab, adjustment in self.history
+        ]
+
     @staticmethod
     def load_state(filepath: str) -> "CalibrationController":
         """Loads a controller state from a file using pickle."""
@@ -30,9 +30,11 @@ Obtain the figure object and manage closing yourself::
 """
 
 import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.figure import Figure
 
 
-def plot(history, show=False, savepath=None, auto_close=True):
+def plot(history, show=False, savepath=None, auto_close=True, fig=None):
     """Plot convergence series stored in ``history``.
 
     Parameters
@@ -41,21 +43,44 @@ def plot(history, show=False, savepath=None, auto_close=True):
         Mapping of metric names to sequences of numeric values.
     show : bool
         If True, call :func:`matplotlib.pyplot.show()` to display the plot.
-    savepath : str | None
-        If provided, save the figure to this path using
+    savepath : str | file-like | None
+        If provided, save the figure to this path or binary file object using
         :meth:`matplotlib.figure.Figure.savefig`.
     auto_close : bool
         If True (default) close the figure after save/show to avoid
-        leaking GUI resources in long-running processes or tests.
+        leaking GUI resources in long-running processes or tests. With
+        ``show=False`` the figure is then created outside pyplot
+        altogether, so there is no figure manager to set up or close.
+    fig : matplotlib.figure.Figure | None
+        Existing figure to draw into instead of creating a new one. It is
+        cleared first and left open for the caller to reuse; ``auto_close``
+        does not apply to it.
 
     Returns
     -------
-    matplotlib.figure.Figure
-        The created figure object.
+    matplotlib.figure.Figure | None
+        The figure drawn into, or None when ``history`` holds no
+        values; nothing is drawn, saved or shown in that case.
     """
-    fig, ax = plt.subplots()
-    for k, v in history.items():
-        ax.plot(v, label=k)
+    if not any(len(v) for v in history.values()):
+        return None
+
+    owned = fig is None
+    standalone = owned and auto_close and not show
+    if not owned:
+        fig.clear()
+        ax = fig.add_subplot()
+    elif standalone:
+        fig = Figure()
+        ax = fig.add_subplot()
+    else:
+        fig, ax = plt.subplots()
+    # Draw every series in one call: columns of a NaN-padded matrix.
+    length = max(len(v) for v in history.values())
+    series = np.full((length, len(history)), np.nan)
+    for i, v in enumerate(history.values()):
+        series[:len(v), i] = v
+    ax.plot(np.arange(length), series, label=list(history))
     ax.axhline(0, linestyle="--", color="grey")
     ax.legend()
     ax.grid(True)
@@ -66,7 +91,7 @@ def plot(history, show=False, savepath=None, auto_close=True):
     if show:
         plt.show()
 
-    if auto_close:
+    if owned and auto_close and not standalone:
         plt.close(fig)
 
     return fig
@@ -76,5 +101,7 @@ def close(fig):
     """Close a figure created by :func:`plot`.
 
     This is a convenience wrapper around :func:`matplotlib.pyplot.close`.
+    ``None``, as returned by :func:`plot` for an empty history, is ignored.
     """
-    plt.close(fig)
+    if fig is not None:
+        plt.close(fig)
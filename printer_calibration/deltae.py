@@ -6,7 +6,12 @@ perceptual colour differences between measured and reference Lab
 triples.
 """
 
+import math
+
 import colour
+import numpy as np
+
+from .deltae_numba import ciede2000_scalar
 
 
 def delta_e(lab_meas, lab_ref):
@@ -22,4 +27,29 @@ def delta_e(lab_meas, lab_ref):
     float
         The computed Delta E value.
     """
+    # Single finite triples go through the compiled kernel when numba is
+    # available, avoiding colour.delta_E's per-call array overhead. Anything
+    # else, including NaN from a missing reading, is left to colour-science.
+    if ciede2000_scalar is not None and np.shape(lab_meas) == np.shape(lab_ref) == (3,):
+        values = [float(v) for v in (*lab_meas, *lab_ref)]
+        if all(map(math.isfinite, values)):
+            return float(ciede2000_scalar(*values))
     return float(colour.delta_E(lab_meas, lab_ref, method="CIE 2000"))
+
+
+def delta_e_batch(lab_meas, lab_ref):
+    """Return the Delta E (CIEDE2000) for each pair of rows in two Lab arrays.
+
+    Parameters
+    ----------
+    lab_meas, lab_ref : array_like
+        Arrays of shape (N, 3) holding measured and reference Lab triples.
+
+    Returns
+    -------
+    numpy.ndarray
+        Array of shape (N,) with one Delta E value per row.
+    """
+    lab_meas = np.asarray(lab_meas, dtype=float)
+    lab_ref = np.asarray(lab_ref, dtype=float)
+    return np.asarray(colour.delta_E(lab_meas, lab_ref, method="CIE 2000"), dtype=float)
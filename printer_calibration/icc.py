@@ -10,6 +10,8 @@ import numpy as np
 import pandas as pd
 import colour
 
+from .analysis import get_patch_labs
+
 
 def build_and_export_icc(
     measurements_df: pd.DataFrame, 
@@ -43,19 +45,18 @@ def build_and_export_icc(
         # 1. Extract Primaries from measurements
         # We need R (255,0,0), G (0,255,0), B (0,0,255) to build the matrix.
         # Assuming patch names "R", "G", "B" exist in the dataframe.
-        primaries = {}
-        for name in ["R", "G", "B"]:
-            row = measurements_df[measurements_df["patch"] == name]
-            if row.empty:
+        names = ("R", "G", "B")
+        labs = get_patch_labs(measurements_df, names)
+        for name, lab in zip(names, labs):
+            if lab is None:
                 return False, f"Missing required patch '{name}' for ICC generation."
-            
-            # Get Lab and convert to XYZ (D50)
-            # Note: colour.Lab_to_XYZ returns XYZ scaled 0..1 (usually) or 0..100 depending on setup.
-            # ICC requires XYZ encoded as s15Fixed16Number (approx 0..1 range usually mapped).
-            # colour default is 0..1 for XYZ if Lab is 0..100.
-            L, a, b = row.iloc[0][["L", "a", "b"]]
-            XYZ = colour.Lab_to_XYZ([L, a, b]) # Uses D50 by default in recent colour versions for Lab
-            primaries[name] = XYZ
+
+        # Convert all three Lab values to XYZ (D50) in one call.
+        # Note: colour.Lab_to_XYZ returns XYZ scaled 0..1 (usually) or 0..100 depending on setup.
+        # ICC requires XYZ encoded as s15Fixed16Number (approx 0..1 range usually mapped).
+        # colour default is 0..1 for XYZ if Lab is 0..100.
+        XYZ = colour.Lab_to_XYZ(np.array(labs, dtype=float)) # Uses D50 by default in recent colour versions for Lab
+        primaries = dict(zip(names, XYZ))
 
         # 2. Prepare Tags
         # D50 standard illuminant for PCS
@@ -135,11 +136,10 @@ def build_and_export_icc(
         struct.pack_into('>I', header, 64, 1) # Rendering Intent: Perceptual
         struct.pack_into('>III', header, 68, 0x0000F6D6, 0x00010000, 0x0000D32D) # D50 XYZ
 
-        # Write to file
+        # Write to file as a single buffer
+        profile = header + tag_table_data + tag_data_block
         with open(filename, "wb") as f:
-            f.write(header)
-            f.write(tag_table_data)
-            f.write(tag_data_block)
+            f.write(profile)
 
         return True, f"Successfully exported valid ICC profile to {filename}"
 
@@ -8,13 +8,35 @@ ensures the returned DataFrame contains the canonical columns
 to numbers where possible.
 """
 
+import codecs
+import contextlib
+import csv
+import io
 import warnings
 
 import pandas as pd
 
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:  # pragma: no cover - pyarrow is optional
+    pa = pa_csv = None
+
 # canonical required column names (note capital 'L')
 CANONICAL_ANALYSIS_COLUMNS = {"patch", "L", "a", "b"}
 
+# lower-cased, stripped column name -> canonical name
+_CANONICAL_NAMES = {
+    "patch": "patch",
+    "label": "patch",  # Map 'label' to 'patch'
+    "l": "L",
+    "a_lab": "a",      # Map 'a_lab' to 'a'
+    "b_lab": "b",      # Map 'b_lab' to 'b'
+    "r": "r",          # Keep 'r' as 'r'
+    "g": "g",          # Keep 'g' as 'g'
+    "b": "b_rgb",      # Map 'b' from r,g,b to 'b_rgb' to avoid conflict with Lab 'b'
+}
+
 
 def _normalize_columns(columns):
     """Return a rename mapping from original column name -> canonical name.
@@ -22,31 +44,114 @@ def _normalize_columns(columns):
     The function matches columns case-insensitively and strips
     surrounding whitespace. For example ' l ' or 'L' -> 'L'.
     """
-    canon = {
-        "patch": "patch",
-        "label": "patch",  # Map 'label' to 'patch'
-        "l": "L",
-        "a_lab": "a",      # Map 'a_lab' to 'a'
-        "b_lab": "b",      # Map 'b_lab' to 'b'
-        "r": "r",          # Keep 'r' as 'r'
-        "g": "g",          # Keep 'g' as 'g'
-        "b": "b_rgb",      # Map 'b' from r,g,b to 'b_rgb' to avoid conflict with Lab 'b'
+    return {
+        col: _CANONICAL_NAMES[key]
+        for col in columns
+        if (key := col.strip().lower()) in _CANONICAL_NAMES
     }
-    rename = {}
-    for col in columns:
-        key = col.strip().lower()
-        if key in canon:
-            rename[col] = canon[key]
-    return rename
 
 
-def load_csv(path):
+def _column_filter(columns):
+    """Return a predicate selecting the file columns that map to `columns`.
+
+    `columns` holds canonical names; file columns without a canonical
+    mapping are matched by their own name.
+    """
+    wanted = set(columns)
+
+    def keep(col):
+        return _CANONICAL_NAMES.get(col.strip().lower(), col) in wanted
+
+    return keep
+
+
+def _read_csv_pyarrow(source, usecols=None):
+    """Read ``source`` with pyarrow's multithreaded CSV reader.
+
+    ``source`` is a path or the file contents as bytes. pyarrow has no
+    equivalent of pandas' ``comment`` option, so comment text and blank
+    lines are stripped before the buffer is parsed; files without
+    comments are handed to pyarrow as read. ``usecols`` is an optional
+    predicate on the header names; columns it rejects are not converted.
+    """
+    if isinstance(source, bytes):
+        data = source
+    else:
+        with open(source, "rb") as f:
+            data = f.read()
+    # Spreadsheet exports often start with a UTF-8 BOM; it would otherwise
+    # stay attached to the first header name picked out below.
+    if data.startswith(codecs.BOM_UTF8):
+        data = data[len(codecs.BOM_UTF8):]
+    if b"#" in data:
+        lines = [line.split(b"#", 1)[0] for line in data.splitlines()]
+        data = b"\n".join(line for line in lines if line.strip())
+    else:
+        data = data.lstrip(b"\r\n")  # pyarrow takes the first line as the header
+    convert_options = None
+    if usecols is not None:
+        header = next(csv.reader([data.split(b"\n", 1)[0].rstrip(b"\r").decode()]))
+        convert_options = pa_csv.ConvertOptions(
+            include_columns=[name for name in header if usecols(name)]
+        )
+    return pa_csv.read_csv(
+        pa.BufferReader(data), convert_options=convert_options
+    ).to_pandas()
+
+
+def peek_csv(path):
+    """Return a measurement CSV's canonical column names and whether it has data.
+
+    Only the header line and the first data line are read, so the cost
+    does not depend on the file size. Comments and blank lines are
+    skipped as in :func:`load_csv`. ``path`` may also be an open text
+    file object, which is read from its current position.
+
+    Returns
+    -------
+    tuple[list[str], bool]
+        The normalized column names and whether at least one data row
+        follows the header.
+    """
+    header = None
+    has_rows = False
+    if hasattr(path, "read"):
+        opened = contextlib.nullcontext(path)
+    else:
+        opened = open(path, newline="", encoding="utf-8-sig")
+    with opened as f:
+        for line in f:
+            line = line.split("#", 1)[0]
+            if not line.strip():
+                continue
+            if header is None:
+                header = next(csv.reader([line]))
+            else:
+                has_rows = True
+                break
+    if header is None:
+        return [], False
+    rename_map = _normalize_columns(header)
+    return [rename_map.get(col, col) for col in header], has_rows
+
+
+def load_csv(path, engine="auto", columns=None):
     """Load a measurement CSV and return a cleaned pandas.DataFrame.
 
     Parameters
     ----------
-    path : str
-        Path to the CSV file.
+    path : str | file-like
+        Path to the CSV file, or an open text or binary file object such
+        as :class:`io.StringIO`.
+    engine : str
+        ``"auto"`` (default), ``"pandas"`` or ``"pyarrow"``. The pyarrow
+        reader is faster on large files; if it cannot parse the file the
+        pandas reader is used instead. ``"auto"`` uses pyarrow when it is
+        installed.
+    columns : iterable of str | None
+        Canonical column names to keep, e.g.
+        ``CANONICAL_ANALYSIS_COLUMNS``. Other columns are skipped while
+        parsing. By default every column is read.
 
     Returns
     -------
@@ -56,13 +161,37 @@ def load_csv(path):
         normalization.
     """
 
-    # Try a permissive read that ignores comment lines beginning with '#'.
-    try:
-        df = pd.read_csv(path, comment="#", skip_blank_lines=True)
-    except Exception:
-        # Fall back to the python engine which is more permissive with
-        # malformed CSV files and mixed delimiters.
-        df = pd.read_csv(path, comment="#", skip_blank_lines=True, engine="python")
+    usecols = _column_filter(columns) if columns is not None else None
+
+    if engine == "auto":
+        engine = "pyarrow" if pa_csv is not None else "pandas"
+
+    # A file object can only be read once, but a failed parse falls back to
+    # the next reader; keep its contents so every reader starts afresh.
+    data = None
+    if hasattr(path, "read"):
+        data = path.read()
+        if isinstance(data, str):
+            data = data.encode()
+
+    def source():
+        return path if data is None else io.BytesIO(data)
+
+    df = None
+    if engine == "pyarrow" and pa_csv is not None:
+        try:
+            df = _read_csv_pyarrow(path if data is None else data, usecols)
+        except Exception:
+            df = None
+
+    if df is None:
+        # Try a permissive read that ignores comment lines beginning with '#'.
+        try:
+            df = pd.read_csv(source(), comment="#", skip_blank_lines=True, usecols=usecols)
+        except Exception:
+            # Fall back to the python engine which is more permissive with
+            # malformed CSV files and mixed delimiters.
+            df = pd.read_csv(source(), comment="#", skip_blank_lines=True, usecols=usecols, engine="python")
 
     # Drop unnamed/index columns often produced by spreadsheets
     unnamed = [c for c in df.columns
@@ -84,17 +213,24 @@ def load_csv(path):
 
     # Coerce numeric Lab values to numbers where possible; be tolerant of
     # non-numeric garbage and drop rows that have no valid Lab data.
-    for col in ("L", "a", "b"):
-        df[col] = pd.to_numeric(df[col], errors="coerce")
+    # Columns the reader already parsed as numbers are left untouched.
+    lab_cols = ["L", "a", "b"]
+    for col in lab_cols:
+        if not pd.api.types.is_numeric_dtype(df[col]):
+            df[col] = pd.to_numeric(df[col], errors="coerce")
 
     # Warn and drop rows where all three Lab values are missing
-    lab_na = (df[["L", "a", "b"]].isna().all(axis=1))
+    lab_na = df[lab_cols].isna().to_numpy().all(axis=1)
     if lab_na.any():
         n = lab_na.sum()
         warnings.warn(f"{n} row(s) have no valid L/a/b values and will be dropped")
-        df = df.loc[~lab_na].copy()
+        df = df.loc[~lab_na]
 
-    # Reset index for a clean DataFrame
+    # Reset index for a clean DataFrame (this also materialises the filtered rows)
     df = df.reset_index(drop=True)
 
+    # Patch names come from a small fixed vocabulary; store them as integer
+    # codes so lookups and joins on 'patch' avoid per-row string hashing.
+    df["patch"] = df["patch"].astype("category")
+
     return df
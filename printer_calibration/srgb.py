@@ -0,0 +1,45 @@
+"""sRGB helpers for converting 8-bit patch colours to CIE-Lab.
+
+The conversion matches ``colour.XYZ_to_Lab(colour.sRGB_to_XYZ(rgb / 255))``
+(sRGB primaries, D65 illuminant, 2-degree observer) but decodes the
+transfer function through a 256-entry lookup table, so 8-bit inputs need
+no power evaluation for the decode step.
+"""
+
+import colour
+import numpy as np
+
+_SRGB = colour.RGB_COLOURSPACES["sRGB"]
+
+# Linear-light value for each 8-bit sRGB code value, indexed by the code.
+SRGB_TO_LINEAR_U8 = colour.models.eotf_sRGB(np.arange(256) / 255)
+SRGB_TO_LINEAR_U8.flags.writeable = False
+
+# Linear sRGB -> CIE XYZ, and the D65 reference white (Y = 1) used for Lab.
+RGB_TO_XYZ = _SRGB.matrix_RGB_to_XYZ
+_x, _y = _SRGB.whitepoint
+WHITE_XYZ = np.array([_x / _y, 1.0, (1 - _x - _y) / _y])
+
+
+def _lab_f(t):
+    """CIE 1976 intermediate lightness function."""
+    return np.where(t > (24 / 116) ** 3, np.power(t, 1 / 3), (841 / 108) * t + 16 / 116)
+
+
+def srgb_u8_to_lab(rgb_u8):
+    """Convert 8-bit sRGB values to CIE-Lab.
+
+    Parameters
+    ----------
+    rgb_u8 : array_like
+        Integer array of shape (..., 3) with values in 0-255.
+
+    Returns
+    -------
+    numpy.ndarray
+        Lab values of shape (..., 3).
+    """
+    linear = SRGB_TO_LINEAR_U8[np.asarray(rgb_u8, dtype=np.intp)]
+    xyz = linear @ RGB_TO_XYZ.T
+    fx, fy, fz = np.moveaxis(_lab_f(xyz / WHITE_XYZ), -1, 0)
+    return np.stack([116 * fy - 16, 500 * (fx - fy), 200 * (fy - fz)], axis=-1)
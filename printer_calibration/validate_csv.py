@@ -5,21 +5,37 @@ Usage:
     python -m printer_calibration.validate_csv path/to/file.csv
 
 The script will exit with status 0 if the CSV is valid, and non-zero if
-validation fails.
+validation fails. By default only the header and the first data row are
+checked; pass ``--deep`` to parse the whole file as the GUI would.
 """
 
 import argparse
 import sys
 
-from .io import load_csv
+from .io import CANONICAL_ANALYSIS_COLUMNS, load_csv, peek_csv
 
 
-def validate(path: str) -> None:
-    """Load and validate the CSV file. Raises ValueError on failure."""
-    # load_csv already checks REQUIRED and raises ValueError if missing
-    df = load_csv(path)
-    # Additional sanity checks can be added here if needed
-    if df.empty:
+def validate(path: str, deep: bool = False) -> None:
+    """Validate the CSV file. Raises ValueError on failure.
+
+    The quick check only reads the header and looks for a data row. With
+    ``deep=True`` the file is fully loaded, which also rejects files whose
+    rows hold no valid L/a/b values. ``path`` may also be an open text
+    file object.
+    """
+    if deep:
+        # load_csv already checks REQUIRED and raises ValueError if missing
+        df = load_csv(path, columns=CANONICAL_ANALYSIS_COLUMNS)
+        # Additional sanity checks can be added here if needed
+        if df.empty:
+            raise ValueError("CSV appears to be empty")
+        return
+
+    columns, has_rows = peek_csv(path)
+    missing_lab_cols = CANONICAL_ANALYSIS_COLUMNS.difference(columns)
+    if missing_lab_cols:
+        raise ValueError(f"CSV must contain core Lab columns {CANONICAL_ANALYSIS_COLUMNS}; missing: {missing_lab_cols}")
+    if not has_rows:
         raise ValueError("CSV appears to be empty")
 
 
@@ -29,10 +45,15 @@ def main() -> None:
         description="Validate measurement CSV file for required columns",
     )
     parser.add_argument("path", help="Path to the measurement CSV file")
+    parser.add_argument(
+        "--deep",
+        action="store_true",
+        help="Parse the whole file and check its Lab values, not just the header",
+    )
     args = parser.parse_args()
 
     try:
-        validate(args.path)
+        validate(args.path, deep=args.deep)
     except Exception as exc:  # pragma: no cover - top-level reporting
         print(f"Validation failed: {exc}", file=sys.stderr)
         sys.exit(2)
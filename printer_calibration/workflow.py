@@ -34,7 +34,13 @@ from .config import InkSteps
 from printer_calibration.charts import (
     generate_neutral_chart,
     generate_colour_chart,
+    page_canvas,
+    render_colour_chart,
+    render_neutral_chart,
+    save_chart,
+    write_measurement_template,
 )
+from printer_calibration.config import COLOUR_PATCHES
 
 
 def generate_chart(
@@ -59,20 +65,29 @@ def generate_chart(
     format : str | None
         Optional explicit image format to pass to Pillow's ``save``
         (for example ``'PDF'``). If omitted the filename extension is
-        used to determine the format.
+        used to determine the format. With ``all_charts`` several formats
+        may be given separated by commas (for example ``'PNG,PDF'``).
     dpi : int
         DPI to use for neutral chart generation (where applicable).
     """
     # Choose sensible default filenames that match requested format
     # If requested, generate all available charts.
     if all_charts:
-        # Compute a single extension to use for all chart filenames
-        ext = format.lower().lstrip('.') if format else 'png'
-        neutral_out = f"neutral_chart.{ext}"
-        colour_out = f"colour_test_A4.{ext}"
-
-        generate_neutral_chart(neutral_out, dpi=dpi, format=format, title=title)
-        generate_colour_chart(colour_out, format=format, title=title)
+        # Render each chart once, then save it in every requested format.
+        formats = [f.strip() for f in format.split(",")] if format else [None]
+        colour_dpi = 300  # --dpi only applies to the neutral chart
+        # Both charts are drawn into one page buffer; the rendered images
+        # are copies, so the buffer can be cleared and reused.
+        canvas = page_canvas(dpi)
+        neutral_img = render_neutral_chart(dpi=dpi, title=title, canvas=canvas)
+        write_measurement_template(COLOUR_PATCHES)
+        colour_img = render_colour_chart(dpi=colour_dpi, title=title, canvas=canvas)
+
+        for fmt in formats:
+            # Use the format as the extension for both chart filenames
+            ext = fmt.lower().lstrip('.') if fmt else 'png'
+            save_chart(neutral_img, f"neutral_chart.{ext}", format=fmt)
+            save_chart(colour_img, f"colour_test_A4.{ext}", format=fmt, dpi=colour_dpi)
         return
 
     if chart_type == "neutral":
@@ -0,0 +1,18 @@
+"""Test package for printer_calibration.
+
+Matplotlib is pinned to the non-interactive Agg backend before any test
+imports pyplot, so chart and convergence tests never start a GUI event
+loop. Setting ``MPLBACKEND`` as well covers subprocesses. This lives here
+rather than in a pytest conftest so that ``python -m unittest discover``
+gets the same backend. Figures are drawn and saved at 72 dpi, since the
+tests only check that output is produced.
+"""
+
+import os
+
+os.environ["MPLBACKEND"] = "Agg"
+
+import matplotlib  # noqa: E402
+
+matplotlib.use("Agg", force=True)
+matplotlib.rcParams.update({"figure.dpi": 72, "savefig.dpi": 72})
@@ -0,0 +1,59 @@
+"""Reference charts rendered once per test run.
+
+Several test modules only need to inspect a finished chart, so each chart
+is rendered in memory on first request and reused afterwards; nothing is
+written to disk. Tests that only sample pixels get the rendered image as
+an array, which skips the PNG encode and decode. Plain cached functions
+are used instead of pytest fixtures so the unittest runner shares them
+too. Everything is rendered at 72 dpi, which exercises the same layout
+code as print resolution with a sixteenth of the pixels.
+"""
+
+import functools
+import io
+
+import numpy as np
+
+from printer_calibration import charts
+
+
+def _encode(generate, *args, **kwargs):
+    buf = io.BytesIO()
+    generate(buf, *args, **kwargs)
+    return buf.getvalue()
+
+
+def _pixels(img):
+    """Return a read-only (h, w, 3) uint8 view of a rendered chart."""
+    arr = np.asarray(img)
+    arr.flags.writeable = False
+    return arr
+
+
+@functools.lru_cache(maxsize=None)
+def neutral_png():
+    return _encode(charts.generate_neutral_chart, dpi=72, format="PNG")
+
+
+@functools.lru_cache(maxsize=None)
+def neutral_pdf():
+    return _encode(charts.generate_neutral_chart, dpi=72, format="PDF")
+
+
+@functools.lru_cache(maxsize=None)
+def colour_png():
+    # generate_colour_chart also writes the measurement template into the
+    # working directory, so render and save the chart directly instead.
+    buf = io.BytesIO()
+    charts.save_chart(charts.render_colour_chart(dpi=72), buf, format="PNG", dpi=72)
+    return buf.getvalue()
+
+
+@functools.lru_cache(maxsize=None)
+def neutral_titled_pixels():
+    return _pixels(charts.render_neutral_chart(dpi=72, title="Neutral Title Test"))
+
+
+@functools.lru_cache(maxsize=None)
+def colour_titled_pixels():
+    return _pixels(charts.render_colour_chart(dpi=72, title="Colour Title Test"))
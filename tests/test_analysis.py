@@ -1,8 +1,20 @@
 import unittest
+import numpy as np
 import pandas as pd
 
-from printer_calibration.analysis import suggest_adjustment
-from printer_calibration.config import InkSteps, Phase1Targets
+from printer_calibration.analysis import (
+    PatchLabs,
+    analyze_color_patches,
+    get_lab_distance,
+    get_lab_distances,
+    get_patch_lab,
+    get_patch_labs,
+    get_reference_lab_array,
+    get_reference_lab_values,
+    make_analyzer,
+    suggest_adjustment,
+)
+from printer_calibration.config import COLOUR_PATCHES, InkSteps, Phase1Targets, Phase4Targets
 
 
 class TestAnalysis(unittest.TestCase):
@@ -29,6 +41,87 @@ class TestAnalysis(unittest.TestCase):
         self.assertEqual(adj.get("Y", 0), 4)
         self.assertEqual(adj.get("C", 0), 0)
 
+    def test_get_patch_lab(self):
+        df = pd.DataFrame({
+            "patch": ["RGB100", "RGB150", "RGB150"],
+            "L": [38.0, 55.0, 56.0],
+            "a": [0.5, -0.5, 0.0],
+            "b": [1.0, -1.0, 0.0],
+        })
+        # The first row for a patch is used.
+        self.assertEqual(get_patch_lab(df, "RGB150"), (55.0, -0.5, -1.0))
+        self.assertIsNone(get_patch_lab(df, "RGB200"))
+        self.assertEqual(
+            get_patch_labs(df, ["RGB150", "RGB200", "RGB100"]),
+            [(55.0, -0.5, -1.0), None, (38.0, 0.5, 1.0)],
+        )
+        labs = PatchLabs(df)
+        self.assertEqual(labs.get("RGB150"), (55.0, -0.5, -1.0))
+        self.assertIsNone(labs.get("RGB200"))
+
+    def test_categorical_patch_column(self):
+        # load_csv stores 'patch' as a categorical; lookups must not change.
+        df = pd.DataFrame({
+            "patch": ["RGB100", "RGB150", "RGB150", "RGB50"],
+            "L": [38.0, 55.0, 56.0, 20.0],
+            "a": [0.5, -0.5, 0.0, 1.5],
+            "b": [1.0, -1.0, 0.0, -2.0],
+        })
+        cat = df.assign(patch=df["patch"].astype("category"))
+        names = ["RGB150", "RGB200", "RGB100", "RGB50"]
+        for name in names:
+            self.assertEqual(get_patch_lab(cat, name), get_patch_lab(df, name))
+            self.assertEqual(PatchLabs(cat).get(name), PatchLabs(df).get(name))
+        self.assertEqual(get_patch_labs(cat, names), get_patch_labs(df, names))
+        self.assertEqual(get_patch_lab(cat, "RGB150"), (55.0, -0.5, -1.0))
+
+    def test_analyze_color_patches_categorical(self):
+        targets = Phase4Targets()
+        names = [p[0] for p in COLOUR_PATCHES]
+        ref = np.array(get_reference_lab_array())
+        shifted = ref + np.linspace(0, 3, len(ref))[:, None]
+        # A repeated patch (the later reading wins) and one missing patch.
+        df = pd.DataFrame({
+            "patch": names[1:] + [names[2]],
+            "L": [*shifted[1:, 0], 99.0],
+            "a": [*shifted[1:, 1], 0.0],
+            "b": [*shifted[1:, 2], 0.0],
+        })
+        cat = df.assign(patch=df["patch"].astype("category"))
+        self.assertEqual(analyze_color_patches(cat, targets), analyze_color_patches(df, targets))
+
+    def test_lab_distances(self):
+        self.assertAlmostEqual(get_lab_distance((50, 0, 0), (53, 4, 0)), 5.0)
+        labs_a = [(50, 0, 0), (60, 1, -1)]
+        labs_b = [(53, 4, 0), (50, 0, 0), (60, 1, 1)]
+        dists = get_lab_distances(labs_a, labs_b)
+        self.assertEqual(dists.shape, (2, 3))
+        np.testing.assert_allclose(
+            dists, [[get_lab_distance(a, b) for b in labs_b] for a in labs_a]
+        )
+
+    def test_make_analyzer(self):
+        targets = Phase4Targets()
+        analyze = make_analyzer(targets)
+        self.assertIs(analyze, make_analyzer(targets))
+        ref = np.array(get_reference_lab_array())
+        passed, report = analyze(ref)
+        self.assertTrue(passed)
+        self.assertIn("Mean ΔE:   0.00", report)
+        present = np.zeros(len(ref), dtype=bool)
+        passed, _ = analyze(ref, present)
+        self.assertFalse(passed)
+
+    def test_reference_lab_values_are_cached(self):
+        labs = get_reference_lab_array()
+        self.assertIs(labs, get_reference_lab_array())
+        self.assertEqual(labs.shape, (len(COLOUR_PATCHES), 3))
+        self.assertFalse(labs.flags.writeable)
+        values = get_reference_lab_values()
+        self.assertIs(values, get_reference_lab_values())
+        self.assertEqual(list(values), [p[0] for p in COLOUR_PATCHES])
+        self.assertEqual(tuple(values[COLOUR_PATCHES[0][0]]), tuple(labs[0]))
+
 
 if __name__ == "__main__":
     unittest.main()
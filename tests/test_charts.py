@@ -1,30 +1,39 @@
-import os
-import tempfile
+import io
 import unittest
 
-from printer_calibration.charts import generate_neutral_chart, generate_colour_chart
+from PIL import Image
+
+from printer_calibration.charts import (
+    page_canvas,
+    render_colour_chart,
+    render_neutral_chart,
+)
+
+from . import rendered_charts
 
 
 class TestCharts(unittest.TestCase):
     def test_generate_neutral_chart(self):
-        fd, path = tempfile.mkstemp(suffix=".png")
-        os.close(fd)
-        try:
-            generate_neutral_chart(path, dpi=72)
-            self.assertTrue(os.path.exists(path))
-            self.assertGreater(os.path.getsize(path), 0)
-        finally:
-            os.remove(path)
+        data = rendered_charts.neutral_png()
+        self.assertGreater(len(data), 0)
+        with Image.open(io.BytesIO(data)) as img:
+            self.assertEqual(img.format, "PNG")
 
     def test_generate_colour_chart(self):
-        fd, path = tempfile.mkstemp(suffix=".png")
-        os.close(fd)
-        try:
-            generate_colour_chart(path=path)
-            self.assertTrue(os.path.exists(path))
-            self.assertGreater(os.path.getsize(path), 0)
-        finally:
-            os.remove(path)
+        data = rendered_charts.colour_png()
+        self.assertGreater(len(data), 0)
+        with Image.open(io.BytesIO(data)) as img:
+            self.assertEqual(img.format, "PNG")
+
+    def test_render_into_shared_canvas(self):
+        canvas = page_canvas(dpi=72)
+        expected = render_neutral_chart(dpi=72).tobytes()
+        neutral = render_neutral_chart(dpi=72, canvas=canvas)
+        render_colour_chart(dpi=72, canvas=canvas)
+        # The returned image does not alias the reused buffer.
+        self.assertEqual(neutral.tobytes(), expected)
+        self.assertIs(page_canvas(dpi=72, canvas=canvas), canvas)
+        self.assertTrue((canvas == 255).all())
 
 
 if __name__ == "__main__":
@@ -1,38 +1,20 @@
-import os
-import tempfile
+import io
 import unittest
 
+from printer_calibration import workflow
+
+from . import rendered_charts
+
 
 class TestChartsPDF(unittest.TestCase):
     def test_neutral_chart_pdf_save(self):
-        from printer_calibration import charts
-
-        tf = tempfile.NamedTemporaryFile(delete=False, suffix=".pdf")
-        tf.close()
-        try:
-            charts.generate_neutral_chart(tf.name, format="PDF")
-            self.assertTrue(os.path.exists(tf.name))
-            self.assertGreater(os.path.getsize(tf.name), 0)
-        finally:
-            try:
-                os.remove(tf.name)
-            except OSError:
-                pass
+        data = rendered_charts.neutral_pdf()
+        self.assertTrue(data.startswith(b"%PDF"))
 
     def test_workflow_generate_chart_pdf(self):
-        from printer_calibration import workflow
-
-        tf = tempfile.NamedTemporaryFile(delete=False, suffix=".pdf")
-        tf.close()
-        try:
-            workflow.generate_chart("neutral", filename=tf.name, format="PDF")
-            self.assertTrue(os.path.exists(tf.name))
-            self.assertGreater(os.path.getsize(tf.name), 0)
-        finally:
-            try:
-                os.remove(tf.name)
-            except OSError:
-                pass
+        buf = io.BytesIO()
+        workflow.generate_chart("neutral", filename=buf, format="PDF", dpi=72)
+        self.assertTrue(buf.getvalue().startswith(b"%PDF"))
 
 
 if __name__ == "__main__":
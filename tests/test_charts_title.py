@@ -1,54 +1,25 @@
-import os
-import tempfile
 import unittest
 
-from PIL import Image
+from . import rendered_charts
 
 
 class TestChartTitles(unittest.TestCase):
-    def _sample_top_center_nonwhite(self, img_path, y_coord=None):
-        img = Image.open(img_path).convert("RGB")
-        w, h = img.size
+    def _sample_top_center_nonwhite(self, pixels, y_coord=None):
+        h, w = pixels.shape[:2]
         x = w // 2
         if y_coord is None:
             y = min(40, max(5, h // 20))
         else:
             y = y_coord
-        box = img.crop((x - 5, y - 5, x + 5, y + 5))
-        pixels = list(box.getdata())
-        return any(px != (255, 255, 255) for px in pixels)
+        return bool((pixels[y - 5:y + 5, x - 5:x + 5] != 255).any())
 
-    def test_generate_neutral_chart_with_title(self):
-        from printer_calibration import charts
+    def test_neutral_chart_with_title(self):
+        pixels = rendered_charts.neutral_titled_pixels()
+        self.assertTrue(self._sample_top_center_nonwhite(pixels))
 
-        tf = tempfile.NamedTemporaryFile(delete=False, suffix=".png")
-        tf.close()
-        try:
-            charts.generate_neutral_chart(tf.name, title="Neutral Title Test")
-            self.assertTrue(os.path.exists(tf.name))
-            self.assertGreater(os.path.getsize(tf.name), 0)
-            self.assertTrue(self._sample_top_center_nonwhite(tf.name))
-        finally:
-            try:
-                os.remove(tf.name)
-            except OSError:
-                pass
-
-    def test_generate_colour_chart_with_title(self):
-        from printer_calibration import charts
-
-        tf = tempfile.NamedTemporaryFile(delete=False, suffix=".png")
-        tf.close()
-        try:
-            charts.generate_colour_chart(tf.name, title="Colour Title Test")
-            self.assertTrue(os.path.exists(tf.name))
-            self.assertGreater(os.path.getsize(tf.name), 0)
-            self.assertTrue(self._sample_top_center_nonwhite(tf.name, y_coord=150))
-        finally:
-            try:
-                os.remove(tf.name)
-            except OSError:
-                pass
+    def test_colour_chart_with_title(self):
+        pixels = rendered_charts.colour_titled_pixels()
+        self.assertTrue(self._sample_top_center_nonwhite(pixels, y_coord=36))
 
 
 if __name__ == "__main__":
@@ -1,6 +1,12 @@
 import unittest
 
-from printer_calibration.config import Phase1Targets, InkSteps
+from printer_calibration.config import (
+    COLOUR_PATCHES,
+    COLOUR_PATCH_NAMES,
+    COLOUR_PATCH_RGB_U8,
+    InkSteps,
+    Phase1Targets,
+)
 
 
 class TestConfig(unittest.TestCase):
@@ -18,6 +24,11 @@ class TestConfig(unittest.TestCase):
         self.assertIsInstance(s.coarse, int)
         self.assertIsInstance(s.fine, int)
 
+    def test_colour_patch_arrays_match_patch_list(self):
+        self.assertEqual(COLOUR_PATCH_NAMES, tuple(p[0] for p in COLOUR_PATCHES))
+        self.assertEqual(COLOUR_PATCH_RGB_U8.dtype.name, "uint8")
+        self.assertEqual(COLOUR_PATCH_RGB_U8.tolist(), [list(p[1:]) for p in COLOUR_PATCHES])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,5 +1,7 @@
 import unittest
 
+import matplotlib.pyplot as plt
+
 from printer_calibration.convergence import plot
 
 
@@ -8,7 +10,10 @@ class TestConvergence(unittest.TestCase):
         # Ensure plot doesn't raise when given simple history data.
         history = {"a_mean": [0, 1, 0], "b_mean": [0, -1, 0]}
         # Call plot; visually it would show, but here we only confirm it runs.
+        open_before = plt.get_fignums()
         plot(history)
+        # With the default auto_close the figure is not left open in pyplot.
+        self.assertEqual(plt.get_fignums(), open_before)
 
 
 if __name__ == "__main__":
@@ -1,19 +1,17 @@
-import os
-import tempfile
+import io
 import unittest
 
 import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+
+from printer_calibration.convergence import close, plot
 
 
 class TestConvergenceAPI(unittest.TestCase):
     def test_plot_returns_figure_and_manual_close(self):
-        from printer_calibration.convergence import plot, close
-
         history = {"metric": [0, 1, 0]}
         fig = plot(history, auto_close=False)
         # Should be a Figure instance
-        from matplotlib.figure import Figure
-
         self.assertIsInstance(fig, Figure)
 
         # Figure should exist until we close it
@@ -21,21 +19,25 @@ class TestConvergenceAPI(unittest.TestCase):
         close(fig)
         self.assertFalse(plt.fignum_exists(fig.number))
 
-    def test_plot_savepath_writes_file(self):
-        from printer_calibration.convergence import plot
+    def test_plot_empty_history_returns_none(self):
+        self.assertIsNone(plot({}))
+        fig = plot({"a": [], "b": []}, auto_close=False)
+        self.assertIsNone(fig)
+        close(fig)
+
+    def test_plot_reuses_given_figure(self):
+        fig = Figure()
+        self.assertIs(plot({"a": [1, 2, 3]}, fig=fig), fig)
+        self.assertIs(plot({"a": [3, 2], "b": [1]}, fig=fig), fig)
+        self.assertEqual(len(fig.axes), 1)
+        self.assertEqual(len(fig.axes[0].get_legend().get_texts()), 2)
 
+    def test_plot_savepath_writes_file(self):
         history = {"a": [1, 2, 3], "b": [3, 2, 1]}
-        tf = tempfile.NamedTemporaryFile(delete=False, suffix=".png")
-        tf.close()
-        try:
-            plot(history, savepath=tf.name)
-            self.assertTrue(os.path.exists(tf.name))
-            self.assertGreater(os.path.getsize(tf.name), 0)
-        finally:
-            try:
-                os.remove(tf.name)
-            except OSError:
-                pass
+        buf = io.BytesIO()
+        plot(history, savepath=buf)
+        self.assertGreater(buf.tell(), 0)
+        self.assertTrue(buf.getvalue().startswith(b"\x89PNG"))
 
 
 if __name__ == "__main__":
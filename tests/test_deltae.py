@@ -1,6 +1,9 @@
 import unittest
 
-from printer_calibration.deltae import delta_e
+import colour
+import numpy as np
+
+from printer_calibration.deltae import delta_e, delta_e_batch
 
 
 class TestDeltaE(unittest.TestCase):
@@ -9,6 +12,34 @@ class TestDeltaE(unittest.TestCase):
         val = delta_e((50, 0, 0), (50, 0, 0))
         self.assertAlmostEqual(val, 0.0)
 
+    def test_delta_e_matches_colour(self):
+        pairs = [((50, 2, -3), (52, 0, 0)), ((75, -10, 20), (70, -12, 25)), ((20, 0, 0), (30, 0, 0))]
+        for lab_meas, lab_ref in pairs:
+            expected = float(colour.delta_E(lab_meas, lab_ref, method="CIE 2000"))
+            self.assertAlmostEqual(delta_e(lab_meas, lab_ref), expected, delta=1e-6)
+
+    def test_delta_e_nan_input(self):
+        with np.errstate(invalid="ignore"):
+            self.assertTrue(np.isnan(delta_e((np.nan, 0, 0), (50, 1, 1))))
+            self.assertTrue(np.isnan(delta_e((50, 1, 1), (50, 0, np.nan))))
+
+    def test_delta_e_batch_matches_scalar(self):
+        meas = [(50, 2, -3), (75, -10, 20), (20, 0, 0)]
+        ref = [(52, 0, 0), (70, -12, 25), (20, 0, 0)]
+        vals = delta_e_batch(meas, ref)
+        self.assertEqual(vals.shape, (3,))
+        np.testing.assert_allclose(vals, [delta_e(m, r) for m, r in zip(meas, ref)])
+
+    def test_delta_e_batch_large(self):
+        rng = np.random.default_rng(0)
+        lab = rng.uniform((0, -100, -100), (100, 100, 100), size=(1024, 3))
+        np.testing.assert_allclose(delta_e_batch(lab, lab), 0.0, atol=1e-12)
+        ref = rng.uniform((0, -100, -100), (100, 100, 100), size=(1024, 3))
+        vals = delta_e_batch(lab, ref)
+        self.assertEqual(vals.shape, (1024,))
+        expected = [delta_e(m, r) for m, r in zip(lab, ref)]
+        np.testing.assert_allclose(vals, expected, atol=1e-9)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,31 @@
+import unittest
+
+import numpy as np
+
+from printer_calibration.deltae import delta_e_batch
+from printer_calibration.deltae_numba import delta_e_matrix
+
+
+class TestDeltaENumba(unittest.TestCase):
+    def test_matches_colour_implementation(self):
+        rng = np.random.default_rng(0)
+        meas = np.column_stack([rng.uniform(0, 100, 200), rng.uniform(-100, 100, (200, 2))])
+        ref = meas + rng.normal(0, 5, meas.shape)
+        # Identical pairs and achromatic (a = b = 0) rows hit the special cases.
+        ref[0] = meas[0]
+        meas[1, 1:] = 0
+        ref[1, 1:] = 0
+        np.testing.assert_allclose(delta_e_matrix(meas, ref), delta_e_batch(meas, ref), atol=1e-9)
+
+
+    def test_non_finite_rows_give_nan(self):
+        meas = np.array([[np.nan, 0, 0], [50, 2, -3], [50, 0, np.inf]])
+        ref = np.array([[50, 1, 1], [52, 0, 0], [50, 0, 0]])
+        with np.errstate(invalid="ignore"):
+            expected = delta_e_batch(meas, ref)
+        np.testing.assert_allclose(delta_e_matrix(meas, ref), expected, atol=1e-9)
+        self.assertTrue(np.isnan(delta_e_matrix(meas, ref)[[0, 2]]).all())
+
+
+if __name__ == "__main__":
+    unittest.main()
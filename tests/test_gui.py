@@ -0,0 +1,242 @@
+import importlib.util
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+
+try:
+    import PyQt6  # noqa: F401
+except ImportError:  # pragma: no cover - the GUI is optional
+    PyQt6 = None
+
+if PyQt6 is not None:
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtCore import QThreadPool
+    from PyQt6.QtWidgets import QApplication
+
+    from gui import gui
+
+
+@unittest.skipIf(PyQt6 is None, "PyQt6 is not installed")
+class TestMainWindow(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        # PyQt aborts on an exception raised in a slot unless sys.excepthook
+        # has been replaced, so record them and fail the test instead.
+        self.slot_errors = []
+        hook = mock.patch.object(sys, "excepthook", lambda *exc: self.slot_errors.append(exc))
+        hook.start()
+        self.addCleanup(hook.stop)
+        self.window = gui.MainWindow()
+        self.addCleanup(self.window.deleteLater)
+
+    def test_enable_numba_without_numba_installed(self):
+        with mock.patch.dict(sys.modules, {"numba": None}), \
+                mock.patch.object(gui.QMessageBox, "warning") as warning:
+            self.window.numba_action.setChecked(True)
+        warning.assert_called_once()
+        self.assertFalse(self.window.numba_action.isChecked())
+        self.assertEqual(self.slot_errors, [])
+        # Nothing was swapped, so unticking has nothing to restore.
+        self.assertEqual(self.window._jit_originals, [])
+        self.window._set_numba_enabled(False)
+        self.assertEqual(self.slot_errors, [])
+
+    @unittest.skipIf(importlib.util.find_spec("numba") is None, "numba is not installed")
+    def test_enable_numba_compile_failure(self):
+        import numba
+
+        original = gui.analysis.get_lab_distance
+        with mock.patch.object(numba, "njit", side_effect=RuntimeError("no compiler")), \
+                mock.patch.object(gui.QMessageBox, "warning") as warning:
+            self.window.numba_action.setChecked(True)
+        warning.assert_called_once()
+        self.assertFalse(self.window.numba_action.isChecked())
+        self.assertIs(gui.analysis.get_lab_distance, original)
+        self.assertEqual(self.window._jit_originals, [])
+        self.assertEqual(self.slot_errors, [])
+
+    def test_actions_disabled_while_processing(self):
+        release = threading.Event()
+
+        def process(records):
+            release.wait(5)
+            return "done"
+
+        window = self.window
+        guarded = (window.analysis_tab.process_button, window.save_action, window.load_action,
+                   window.reset_action, window.skip_menu.menuAction())
+        with mock.patch.object(window.controller, "process_measurements", process):
+            window.process_measurements([("RGB100", 38.0, 0.5, -1.0)])
+            self.assertFalse(any(w.isEnabled() for w in guarded))
+            self.assertFalse(window.export_tab.export_button.isEnabled())
+            release.set()
+            QThreadPool.globalInstance().waitForDone(5000)
+            self.app.processEvents()
+        self.assertTrue(all(w.isEnabled() for w in guarded))
+        self.assertIn("done", window.results_text.toPlainText())
+        self.assertEqual(self.slot_errors, [])
+
+    def test_overlapping_chart_generation(self):
+        release = threading.Event()
+
+        def generate(path, format=None):
+            release.wait(5)
+
+        tab = self.window.charts_tab
+        with mock.patch.object(gui.charts, "generate_neutral_chart", generate), \
+                mock.patch.object(gui.charts, "generate_colour_chart", generate), \
+                mock.patch.object(gui.QMessageBox, "information") as information:
+            tab.generate_neutral_chart()
+            tab.generate_colour_chart()
+            self.assertEqual(len(tab._workers), 2)
+            release.set()
+            QThreadPool.globalInstance().waitForDone(5000)
+            self.app.processEvents()
+        self.assertEqual(information.call_count, 2)
+        self.assertEqual(tab._workers, set())
+        self.assertTrue(tab.generate_neutral_button.isEnabled())
+        self.assertTrue(tab.generate_colour_button.isEnabled())
+
+
+
+@unittest.skipIf(PyQt6 is None, "PyQt6 is not installed")
+class TestLabTableModel(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.model = gui.LabTableModel(capacity=2)
+        self.resets = []
+        self.changes = []
+        self.model.modelReset.connect(lambda: self.resets.append(True))
+        self.model.dataChanged.connect(lambda top, bottom, roles=None: self.changes.append((top.row(), bottom.row())))
+
+    def test_set_patches_resizes_with_reset(self):
+        self.model.set_patches(["A", "B", "C"])
+        self.assertEqual(len(self.resets), 1)
+        self.assertEqual(self.model.rowCount(), 3)
+        self.assertEqual(self.model.lab.shape, (3, 3))
+        self.assertTrue(np.isnan(self.model.lab).all())
+        self.assertEqual(self.model.data(self.model.index(2, 0)), "C")
+
+    def test_set_patches_same_size_refreshes_in_place(self):
+        self.model.set_patches(["A", "B"])
+        self.resets.clear()
+        self.model.set_patches(["C", "D"], np.array([[50.0, 1.0, -2.0], [np.nan, np.nan, np.nan]]))
+        self.assertEqual(self.resets, [])
+        self.assertEqual(self.changes, [(0, 1)])
+        self.assertEqual(self.model.names, ["C", "D"])
+        self.assertEqual(self.model.data(self.model.index(0, 3)), "-2.00")
+        self.assertEqual(self.model.data(self.model.index(1, 1)), "")
+
+    def test_set_data(self):
+        self.model.set_patches(["A"])
+        index = self.model.index(0, 1)
+        self.assertTrue(self.model.setData(index, " 12.345 "))
+        self.assertEqual(self.model.lab[0, 0], 12.345)
+        self.assertEqual(self.model.data(index), "12.35")
+        self.assertFalse(self.model.setData(index, "abc"))
+        self.assertEqual(self.model.lab[0, 0], 12.345)
+        self.assertTrue(self.model.setData(index, ""))
+        self.assertTrue(np.isnan(self.model.lab[0, 0]))
+        self.assertEqual(self.model.data(index), "")
+        self.assertFalse(self.model.setData(self.model.index(0, 0), "B"))
+        self.assertEqual(self.changes, [(0, 0), (0, 0)])
+
+
+@unittest.skipIf(PyQt6 is None, "PyQt6 is not installed")
+class TestAnalysisTabRecords(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.window = gui.MainWindow()
+        self.addCleanup(self.window.deleteLater)
+        self.tab = self.window.analysis_tab
+        self.tab.populate_table()
+        self.model = self.tab.model
+
+    def fill_row(self, row, values):
+        for col, value in enumerate(values, start=1):
+            self.model.setData(self.model.index(row, col), value)
+
+    def test_unmeasured_rows_are_skipped(self):
+        self.assertEqual(self.tab.get_records_from_table(), [])
+        self.fill_row(1, ("50", "0.5", "-1"))
+        records = self.tab.get_records_from_table()
+        self.assertEqual(records, [{"patch": self.model.names[1], "rgb": "N/A", "L": 50.0, "a": 0.5, "b": -1.0}])
+
+    def test_partial_row_is_rejected(self):
+        self.fill_row(0, ("50", "0.5", "-1"))
+        self.fill_row(2, ("40", "", "1"))
+        with mock.patch.object(gui.QMessageBox, "warning") as warning:
+            self.assertIsNone(self.tab.get_records_from_table())
+        warning.assert_called_once()
+        self.assertIn("row 3", warning.call_args.args[2])
+
+    def test_csv_round_trip(self):
+        self.fill_row(0, ("50.125", "0.5", "-1.25"))
+        self.fill_row(3, ("20", "-3", "4"))
+        records = self.tab.get_records_from_table()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "measurements.csv")
+            gui._write_csv(records, path)
+            df = gui.io.load_csv(path)
+        self.assertEqual(list(df["patch"].astype(str)), [r["patch"] for r in records])
+        np.testing.assert_allclose(df[["L", "a", "b"]].to_numpy(), [[r["L"], r["a"], r["b"]] for r in records])
+
+
+
+@unittest.skipIf(PyQt6 is None or importlib.util.find_spec("pyarrow") is None, "PyQt6 and pyarrow are required")
+class TestReadCsvCache(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp_path = Path(tmp.name)
+        cache_dir = mock.patch.object(gui, "_CACHE_DIR", str(self.tmp_path / "cache"))
+        cache_dir.start()
+        self.addCleanup(cache_dir.stop)
+
+    def write_csv(self, name, contents="patch,L,a,b_lab\nRGB100,38.0,0.5,-1.0\nRGB0,x,y,z\n"):
+        path = self.tmp_path / name
+        path.write_text(contents, encoding="utf-8")
+        return str(path)
+
+    def cache_files(self):
+        return sorted(os.listdir(gui._CACHE_DIR))
+
+    def test_cache_hit_keeps_dropped_row_warning(self):
+        path = self.write_csv("m.csv")
+        for _ in range(2):
+            with self.assertWarnsRegex(UserWarning, "1 row"):
+                df = gui._read_csv(path)
+            self.assertEqual(list(df["patch"]), ["RGB100"])
+        self.assertEqual(len(self.cache_files()), 1)
+
+    def test_loader_change_invalidates_cache(self):
+        path = self.write_csv("m.csv", "patch,L,a,b_lab\nRGB100,38.0,0.5,-1.0\n")
+        gui._read_csv(path)
+        with mock.patch.object(gui, "_loader_fingerprint", return_value="changed"):
+            gui._read_csv(path)
+        self.assertEqual(len(self.cache_files()), 2)
+
+    def test_cache_is_pruned(self):
+        with mock.patch.object(gui, "_CACHE_MAX_FILES", 2):
+            for i in range(4):
+                gui._read_csv(self.write_csv(f"m{i}.csv", "patch,L,a,b_lab\nRGB100,38.0,0.5,-1.0\n"))
+        self.assertEqual(len(self.cache_files()), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,11 +2,33 @@ import os
 import tempfile
 import unittest
 
+import pandas as pd
+
+from printer_calibration.icc import build_and_export_icc
 # from printer_calibration.icc import export_srgb_icc
 
 
 class TestICC(unittest.TestCase):
-    pass
+    def test_build_and_export_icc(self):
+        df = pd.DataFrame({
+            "patch": ["R", "G", "B"],
+            "L": [54.3, 87.7, 32.3],
+            "a": [80.8, -86.2, 79.2],
+            "b": [69.9, 83.2, -107.9],
+        })
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "profile")
+            ok, _ = build_and_export_icc(df, {}, path)
+            self.assertTrue(ok)
+            with open(path + ".icc", "rb") as f:
+                data = f.read()
+            self.assertEqual(int.from_bytes(data[:4], "big"), len(data))
+            self.assertEqual(data[36:40], b"acsp")
+
+            ok, msg = build_and_export_icc(df[df["patch"] != "G"], {}, path)
+            self.assertFalse(ok)
+            self.assertIn("'G'", msg)
+
     # def test_export_srgb_icc(self):
     #     fd, path = tempfile.mkstemp(suffix=".icc")
     #     os.close(fd)
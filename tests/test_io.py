@@ -1,43 +1,72 @@
-import os
+import io
 import tempfile
 import unittest
+from pathlib import Path
 
-from printer_calibration.io import load_csv
+import pandas as pd
+
+from printer_calibration.io import CANONICAL_ANALYSIS_COLUMNS, load_csv
 
 
 class TestLoadCSV(unittest.TestCase):
-    def write_temp(self, contents: str) -> str:
-        fd, path = tempfile.mkstemp(suffix=".csv")
-        os.close(fd)
-        with open(path, "w", encoding="utf-8") as f:
-            f.write(contents)
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp_path = Path(tmp.name)
+
+    def write_temp(self, contents: str) -> Path:
+        path = self.tmp_path / "measurements.csv"
+        path.write_text(contents, encoding="utf-8")
         return path
 
     def test_load_valid_csv(self):
         contents = """patch,rgb,L,a,b_lab
 0,100,53.2,-0.5,1.2
 1,150,67.1,0.1,-0.9
+"""
+        df = load_csv(io.StringIO(contents))
+        self.assertIn("patch", df.columns)
+        self.assertIn("L", df.columns)
+        self.assertIn("a", df.columns)
+        self.assertIn("b", df.columns)
+        self.assertIsInstance(df["patch"].dtype, pd.CategoricalDtype)
+
+    def test_load_selected_columns(self):
+        contents = """# comment
+index,Label,r,g,b,L,a,b_lab,notes
+1,RGB100,100,100,100,38.0,0.5,-1.0,x
 """
         path = self.write_temp(contents)
-        try:
-            df = load_csv(path)
-            self.assertIn("patch", df.columns)
-            self.assertIn("L", df.columns)
-            self.assertIn("a", df.columns)
-            self.assertIn("b", df.columns)
-        finally:
-            os.remove(path)
+        for engine in ("pandas", "pyarrow"):
+            df = load_csv(path, engine=engine, columns=CANONICAL_ANALYSIS_COLUMNS)
+            self.assertEqual(sorted(df.columns), ["L", "a", "b", "patch"])
+            self.assertEqual(df.loc[0, "patch"], "RGB100")
+            self.assertEqual(df.loc[0, "b"], -1.0)
+
+    def test_load_selected_columns_with_bom(self):
+        path = self.tmp_path / "excel.csv"
+        path.write_text("patch,L,a,b_lab\nRGB100,38.0,0.5,-1.0\n", encoding="utf-8-sig")
+        for engine in ("pandas", "pyarrow"):
+            df = load_csv(path, engine=engine, columns=CANONICAL_ANALYSIS_COLUMNS)
+            self.assertEqual(sorted(df.columns), ["L", "a", "b", "patch"])
+            self.assertEqual(df.loc[0, "patch"], "RGB100")
+
+    def test_load_file_object_with_fallback(self):
+        contents = "patch,L,a,b_lab\nRGB100,38.0,0.5,-1.0\n"
+        for buf in (io.StringIO(contents), io.BytesIO(contents.encode())):
+            df = load_csv(buf, engine="pyarrow")
+            self.assertEqual(df.loc[0, "b"], -1.0)
+        # A file pyarrow cannot parse is re-read from the start by pandas.
+        short_row = "patch,L,a,b_lab\nRGB100,38.0,0.5,-1.0\nRGB0,50,0\n"
+        df = load_csv(io.StringIO(short_row), engine="pyarrow")
+        self.assertEqual(list(df["patch"]), ["RGB100", "RGB0"])
 
     def test_load_missing_column_raises(self):
         contents = """patch,rgb,L,a
 0,100,53.2,-0.5
 """
-        path = self.write_temp(contents)
-        try:
-            with self.assertRaises(ValueError):
-                load_csv(path)
-        finally:
-            os.remove(path)
+        with self.assertRaises(ValueError):
+            load_csv(io.StringIO(contents))
 
 
 if __name__ == "__main__":
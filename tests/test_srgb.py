@@ -0,0 +1,22 @@
+import unittest
+
+import colour
+import numpy as np
+
+from printer_calibration.srgb import SRGB_TO_LINEAR_U8, srgb_u8_to_lab
+
+
+class TestSrgb(unittest.TestCase):
+    def test_lut_endpoints(self):
+        self.assertEqual(SRGB_TO_LINEAR_U8.shape, (256,))
+        self.assertEqual(SRGB_TO_LINEAR_U8[0], 0.0)
+        self.assertAlmostEqual(SRGB_TO_LINEAR_U8[255], 1.0)
+
+    def test_matches_colour_conversion(self):
+        rgb = np.array([[0, 0, 0], [255, 255, 255], [224, 172, 105], [10, 128, 250]])
+        expected = colour.XYZ_to_Lab(colour.sRGB_to_XYZ(rgb / 255))
+        np.testing.assert_allclose(srgb_u8_to_lab(rgb), expected, atol=1e-9)
+
+
+if __name__ == "__main__":
+    unittest.main()
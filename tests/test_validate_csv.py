@@ -1,24 +1,35 @@
-import os
+import io
 import tempfile
 import unittest
+from pathlib import Path
 
 from printer_calibration.validate_csv import validate
 
 
 class TestValidateCSV(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = Path(tmp.name) / "measurements.csv"
+
     def test_validate_ok(self):
         contents = """patch,rgb,L,a,b_lab
 0,100,53.2,-0.5,1.2
 1,150,67.1,0.1,-0.9
 """
-        fd, path = tempfile.mkstemp(suffix=".csv")
-        os.close(fd)
-        with open(path, "w", encoding="utf-8") as f:
-            f.write(contents)
-        try:
-            validate(path)
-        finally:
-            os.remove(path)
+        validate(io.StringIO(contents))
+        validate(io.StringIO(contents), deep=True)
+
+    def test_validate_accepts_bom(self):
+        self.path.write_text("patch,L,a,b_lab\nRGB100,38.0,0.5,-1.0\n", encoding="utf-8-sig")
+        validate(self.path)
+        validate(self.path, deep=True)
+
+    def test_validate_rejects_bad_files(self):
+        for contents in ("patch,rgb,L,a\n0,100,53.2,-0.5\n", "# only a header\npatch,L,a,b_lab\n\n"):
+            self.path.write_text(contents, encoding="utf-8")
+            with self.assertRaises(ValueError):
+                validate(self.path)
 
 
 if __name__ == "__main__":
@@ -1,4 +1,5 @@
 import os
+import tempfile
 import unittest
 
 from printer_calibration.workflow import generate_chart
@@ -21,18 +22,28 @@ class TestWorkflow(unittest.TestCase):
 
     def test_generate_all_charts(self):
         # generate all charts into a temporary directory and verify files
-        import tempfile
-
         cwd = os.getcwd()
         with tempfile.TemporaryDirectory() as td:
             os.chdir(td)
             try:
-                generate_chart("neutral", all_charts=True, format="PDF")
+                generate_chart("neutral", all_charts=True, format="PDF", dpi=72)
                 self.assertTrue(os.path.exists("neutral_chart.pdf"))
                 self.assertTrue(os.path.exists("colour_test_A4.pdf"))
             finally:
                 os.chdir(cwd)
 
+    def test_generate_all_charts_multiple_formats(self):
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as td:
+            os.chdir(td)
+            try:
+                generate_chart(all_charts=True, format="PNG,PDF", dpi=72)
+                for name in ("neutral_chart", "colour_test_A4"):
+                    self.assertTrue(os.path.exists(f"{name}.png"))
+                    self.assertTrue(os.path.exists(f"{name}.pdf"))
+            finally:
+                os.chdir(cwd)
+
 
 if __name__ == "__main__":
     unittest.main()